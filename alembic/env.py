@@ -7,7 +7,8 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
-from app.models.orders import OrderModel
+# registers every model on Base.metadata for autogenerate
+import app.models  # noqa: F401
 from app.core.database import Base
 from app.core.config import settings
 
@@ -0,0 +1,70 @@
+"""add order read path indexes
+
+Revision ID: 5c0e7a4d2b91
+Revises: 9f41c2f7b2d1
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c0e7a4d2b91"
+down_revision: Union[str, Sequence[str], None] = "9f41c2f7b2d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_orders_user_id_created_at",
+            "orders",
+            ["user_id", "created_at", "id"],
+            postgresql_include=["status", "total_amount"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_order_items_order_id",
+            "order_items",
+            ["order_id"],
+            postgresql_include=["product_id", "quantity", "price", "seller_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_order_items_seller_id_order_id",
+            "order_items",
+            ["seller_id", "order_id"],
+            postgresql_include=["product_id", "quantity", "price"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_order_items_seller_id_order_id",
+            table_name="order_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_order_items_order_id",
+            table_name="order_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_orders_user_id_created_at",
+            table_name="orders",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
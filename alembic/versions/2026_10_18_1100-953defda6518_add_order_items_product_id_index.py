@@ -0,0 +1,40 @@
+"""add order_items product_id index
+
+Revision ID: 953defda6518
+Revises: 5c0e7a4d2b91
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "953defda6518"
+down_revision: Union[str, Sequence[str], None] = "5c0e7a4d2b91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_order_items_product_id_order_id",
+            "order_items",
+            ["product_id", "order_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_order_items_product_id_order_id",
+            table_name="order_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,40 @@
+"""add order_items seller_id created_at index
+
+Revision ID: f35bb9e40fb1
+Revises: 953defda6518
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f35bb9e40fb1"
+down_revision: Union[str, Sequence[str], None] = "953defda6518"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_order_items_seller_id_created_at",
+            "order_items",
+            ["seller_id", "created_at", "order_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_order_items_seller_id_created_at",
+            table_name="order_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
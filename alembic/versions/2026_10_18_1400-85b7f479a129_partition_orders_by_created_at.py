@@ -0,0 +1,147 @@
+"""partition orders and order_items by created_at
+
+Revision ID: 85b7f479a129
+Revises: 6bc8a3d0bf0f
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "85b7f479a129"
+down_revision: Union[str, Sequence[str], None] = "6bc8a3d0bf0f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# monthly partitions created ahead of now(); later ones come from
+# `python -m app.commands.maintain_partitions`
+MONTHS_AHEAD = 3
+
+COLUMNS = {
+    "orders": "id, user_id, status, total_amount, created_at",
+    "order_items": "id, order_id, product_id, quantity, price, created_at, seller_id",
+}
+
+ORDER_STATUSES = (
+    "PENDING", "RESERVED", "RESERVATION_FAILED", "PAID", "PAYMENT_FAILED", "PREPARING",
+    "SHIPPING", "DELIVERED", "COMPLETED", "CANCELLED", "REFUNDED",
+)
+
+# name, table, columns, include
+INDEXES = (
+    ("ix_orders_user_id_created_at", "orders", ["user_id", "created_at", "id"], ["status", "total_amount"]),
+    ("ix_order_items_order_id", "order_items", ["order_id"], ["product_id", "quantity", "price", "seller_id"]),
+    ("ix_order_items_seller_id_order_id", "order_items", ["seller_id", "order_id"], ["product_id", "quantity", "price"]),
+    ("ix_order_items_product_id_order_id", "order_items", ["product_id", "order_id"], []),
+    ("ix_order_items_seller_id_created_at", "order_items", ["seller_id", "created_at", "order_id"], []),
+)
+
+
+def _create_tables(primary_key: list[str], **table_kw) -> None:
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(*ORDER_STATUSES, name="orderstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint(*primary_key),
+        **table_kw,
+    )
+    op.create_table(
+        "order_items",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("order_id", sa.Uuid(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("seller_id", sa.Uuid(), nullable=True),
+        sa.PrimaryKeyConstraint(*primary_key),
+        **table_kw,
+    )
+
+
+def _create_indexes() -> None:
+    for name, table, columns, include in INDEXES:
+        op.create_index(name, table, columns, postgresql_include=include)
+
+
+def _set_aside_tables(suffix: str) -> None:
+    """Renames the current tables and drops their indexes, whose names are reused."""
+    for name, table, _, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+    for table in COLUMNS:
+        op.rename_table(table, f"{table}_{suffix}")
+        op.execute(f"ALTER TABLE {table}_{suffix} RENAME CONSTRAINT {table}_pkey TO {table}_{suffix}_pkey")
+
+
+def _copy_rows(suffix: str) -> None:
+    for table, columns in COLUMNS.items():
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_{suffix}")
+        op.drop_table(f"{table}_{suffix}")
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Rewrites both tables in one transaction, so it needs a maintenance window
+    sized to the table volume.
+    """
+    _set_aside_tables("unpartitioned")
+    # the partition key has to be part of every unique constraint
+    _create_tables(["id", "created_at"], postgresql_partition_by="RANGE (created_at)")
+
+    # monthly UTC partitions from the oldest row up to MONTHS_AHEAD, named <table>_pYYYY_MM
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month_start timestamp := date_trunc('month', LEAST(
+                (SELECT min(created_at) FROM orders_unpartitioned),
+                (SELECT min(created_at) FROM order_items_unpartitioned),
+                now()
+            ) AT TIME ZONE 'UTC');
+            last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC')
+                + interval '{MONTHS_AHEAD} months';
+            partitioned text;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                FOREACH partitioned IN ARRAY ARRAY['orders', 'order_items'] LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        partitioned || '_p' || to_char(month_start, 'YYYY_MM'),
+                        partitioned,
+                        month_start AT TIME ZONE 'UTC',
+                        (month_start + interval '1 month') AT TIME ZONE 'UTC'
+                    );
+                END LOOP;
+                month_start := month_start + interval '1 month';
+            END LOOP;
+        END $$;
+        """
+    )
+    # catches rows outside the monthly partitions if maintenance falls behind
+    for table in COLUMNS:
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    _copy_rows("unpartitioned")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_aside_tables("partitioned")
+    _create_tables(["id"])
+    # dropping the partitioned parents drops their partitions too
+    _copy_rows("partitioned")
+    _create_indexes()
@@ -0,0 +1,56 @@
+"""create orders_archive
+
+Revision ID: 6bc0fb0235c9
+Revises: 85b7f479a129
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6bc0fb0235c9"
+down_revision: Union[str, Sequence[str], None] = "85b7f479a129"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORDER_STATUSES = (
+    "PENDING", "RESERVED", "RESERVATION_FAILED", "PAID", "PAYMENT_FAILED", "PREPARING",
+    "SHIPPING", "DELIVERED", "COMPLETED", "CANCELLED", "REFUNDED",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "orders_archive",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(*ORDER_STATUSES, name="orderstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("items", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("product_ids", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_orders_archive_user_id",
+        "orders_archive",
+        ["user_id"],
+        postgresql_include=["status"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_orders_archive_user_id", table_name="orders_archive")
+    op.drop_table("orders_archive")
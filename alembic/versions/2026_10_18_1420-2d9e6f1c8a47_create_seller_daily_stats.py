@@ -0,0 +1,51 @@
+"""create seller_daily_stats
+
+Revision ID: 2d9e6f1c8a47
+Revises: 6bc0fb0235c9
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2d9e6f1c8a47"
+down_revision: Union[str, Sequence[str], None] = "6bc0fb0235c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORDER_STATUSES = (
+    "PENDING", "RESERVED", "RESERVATION_FAILED", "PAID", "PAYMENT_FAILED", "PREPARING",
+    "SHIPPING", "DELIVERED", "COMPLETED", "CANCELLED", "REFUNDED",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    The table starts empty; fill it with `python -m app.commands.backfill_seller_stats`
+    once the code maintaining it is deployed.
+    """
+    op.create_table(
+        "seller_daily_stats",
+        sa.Column("seller_id", sa.Uuid(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(*ORDER_STATUSES, name="orderstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("orders_count", sa.Integer(), nullable=False),
+        sa.Column("units", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("seller_id", "day", "status"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("seller_daily_stats")
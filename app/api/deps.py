@@ -4,7 +4,7 @@ from fastapi import Depends
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import async_session_factory
+from app.core.database import async_session_factory, read_session_factory
 
 
 async def get_session() -> AsyncGenerator:
@@ -15,4 +15,10 @@ async def get_session() -> AsyncGenerator:
             await session.rollback()
             raise
 
+
+async def get_read_session() -> AsyncGenerator:
+    async with read_session_factory() as session:
+        yield session
+
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
@@ -1,13 +1,35 @@
+import json
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 
 from app.services import CartService
-from app.schemas import CartSchema
+from app.schemas import CartSchema, UserIdsSchema
 
 cart_router = APIRouter(prefix="/cart", tags=["cart"])
 
 
+@cart_router.post("/bulk")
+async def get_carts_bulk(data: UserIdsSchema):
+    carts = await CartService.get_many(data.user_ids)
+    return {"carts": carts}
+
+
+@cart_router.get("/stream")
+async def stream_carts(chunk_size: int = Query(default=500, ge=1, le=10000)):
+    async def lines():
+        async for carts in CartService.iterate_all(chunk_size):
+            for user_id, products in carts.items():
+                line = {
+                    "user_id": str(user_id),
+                    "cart": [product.model_dump(mode="json") for product in products],
+                }
+                yield json.dumps(line) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @cart_router.get("/{user_id}")
 async def get_cart_by_user_id(
     user_id: UUID,
@@ -22,3 +44,31 @@ async def set_cart(
 ):
     await CartService.set(user_id, products)
     return {"ok": True}
+
+
+@cart_router.post("/{user_id}/items")
+async def add_cart_item(
+    user_id: UUID,
+    product: CartSchema,
+):
+    quantity = await CartService.add_item(user_id, product)
+    return {"ok": True, "product_id": product.product_id, "quantity": quantity}
+
+
+@cart_router.patch("/{user_id}/items/{product_id}")
+async def increment_cart_item(
+    user_id: UUID,
+    product_id: int,
+    delta: int = 1,
+):
+    quantity = await CartService.increment(user_id, product_id, delta)
+    return {"ok": True, "product_id": product_id, "quantity": quantity}
+
+
+@cart_router.delete("/{user_id}/items/{product_id}")
+async def remove_cart_item(
+    user_id: UUID,
+    product_id: int,
+):
+    await CartService.remove_item(user_id, product_id)
+    return {"ok": True}
@@ -3,11 +3,17 @@ from uuid import UUID
 from fastapi import APIRouter
 
 from app.services import FavoritesService
-from app.schemas import FavoriteSchema
+from app.schemas import FavoriteSchema, UserIdsSchema
 
 favorites_router = APIRouter(prefix="/favorites", tags=["favorites"])
 
 
+@favorites_router.post("/bulk")
+async def get_favorites_bulk(data: UserIdsSchema):
+    favorites = await FavoritesService.get_many(data.user_ids)
+    return {"favorites": favorites}
+
+
 @favorites_router.get("/{user_id}")
 async def get_favorites_by_user_id(
     user_id: UUID,
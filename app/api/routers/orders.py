@@ -1,10 +1,21 @@
+from datetime import date
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Response
 
-from app.api.deps import SessionDep
-from app.services import OrderService
-from app.schemas import OrderCreateSchema
+from app.api.deps import SessionDep, ReadSessionDep
+from app.services import OrderService, PurchasesService
+from app.schemas import (
+    OrderCreateSchema,
+    OrdersBatchSchema,
+    OrdersPageSchema,
+    PurchasedProductsSchema,
+)
+from app.services.order_cache import order_cache
+from app.services.read_routing import ReadRouting
+from app.services.seller_stats_service import SellerStatsService
+from app.services.stock_coalescer import stock_check_coalescer
 
 
 orders_router = APIRouter(prefix="/orders", tags=["orders"])
@@ -16,42 +27,96 @@ async def create_order(session: SessionDep, order_data: OrderCreateSchema):
     return product
 
 
+@orders_router.post("/batch")
+async def create_orders_batch(session: SessionDep, orders_data: OrdersBatchSchema):
+    results = await OrderService.create_orders_batch(session, orders_data)
+    return {"results": results}
+
+
+@orders_router.get("/stock-check/stats")
+async def get_stock_check_stats():
+    return stock_check_coalescer.stats.as_dict()
+
+
+@orders_router.get("/cache/stats")
+async def get_order_cache_stats():
+    return order_cache.stats.as_dict()
+
+
 @orders_router.get("/users/{user_id}")
-async def get_orders_by_user_id(session: SessionDep, user_id: UUID):
-    return await OrderService.get_orders_by_user_id(session, user_id)
+async def get_orders_by_user_id(
+    session: SessionDep,
+    read_session: ReadSessionDep,
+    user_id: UUID,
+    page: Annotated[OrdersPageSchema, Query()],
+):
+    read_session = await ReadRouting.session_for_user(user_id, session, read_session)
+    return await OrderService.get_orders_by_user_id(read_session, user_id, page)
 
 
 @orders_router.get("/sellers/{seller_id}")
-async def get_orders_by_seller_id(session: SessionDep, seller_id: UUID):
-    orders = await OrderService.get_orders_by_seller_id(session, seller_id)
-    orders_count = await OrderService.get_orders_count_by_seller_id(session, seller_id)
-    return {"orders_count": orders_count, "orders": orders}
+async def get_orders_by_seller_id(
+    read_session: ReadSessionDep,
+    seller_id: UUID,
+    page: Annotated[OrdersPageSchema, Query()],
+    aggregate: bool = False,
+):
+    if aggregate:
+        content = await OrderService.get_orders_by_seller_id_json(read_session, seller_id, page)
+        return Response(content=content, media_type="application/json")
+
+    orders_page = await OrderService.get_orders_by_seller_id(read_session, seller_id, page)
+    orders_count = await OrderService.get_orders_count_by_seller_id(read_session, seller_id)
+    return {"orders_count": orders_count, **orders_page}
 
 
 @orders_router.get("/sellers/{seller_id}/count")
-async def get_orders_count_by_seller_id(session: SessionDep, seller_id: UUID):
-    orders_count = await OrderService.get_orders_count_by_seller_id(session, seller_id)
+async def get_orders_count_by_seller_id(read_session: ReadSessionDep, seller_id: UUID):
+    orders_count = await OrderService.get_orders_count_by_seller_id(read_session, seller_id)
     return {"orders_count": orders_count}
 
 
+@orders_router.get("/sellers/{seller_id}/stats")
+async def get_seller_stats(
+    read_session: ReadSessionDep,
+    seller_id: UUID,
+    date_from: Annotated[date | None, Query(alias="from")] = None,
+    date_to: Annotated[date | None, Query(alias="to")] = None,
+):
+    return await SellerStatsService.get_stats(read_session, seller_id, date_from, date_to)
+
+
 @orders_router.get("/{order_id}")
-async def get_order_by_id(session: SessionDep, order_id: UUID):
-    product = await OrderService.get_order_by_id(session, order_id)
+async def get_order_by_id(session: SessionDep, read_session: ReadSessionDep, order_id: UUID):
+    read_session = await ReadRouting.session_for_order(order_id, session, read_session)
+    product = await OrderService.get_order_by_id(read_session, order_id, primary_session=session)
     return product
 
 
 @orders_router.get("/users/{user_id}/purchased-products/{product_id}")
 async def check_purchased_products(
     session: SessionDep,
+    read_session: ReadSessionDep,
     user_id: UUID,
     product_id: int,
 ):
-    has_purchased = await OrderService.has_user_purchased_product(
-        session, user_id, product_id
-    )
+    read_session = await ReadRouting.session_for_user(user_id, session, read_session)
+    has_purchased = await PurchasesService.has_purchased(read_session, user_id, product_id)
     return {"has_purchased": has_purchased}
 
 
+@orders_router.post("/users/{user_id}/purchased-products")
+async def check_purchased_products_batch(
+    session: SessionDep,
+    read_session: ReadSessionDep,
+    user_id: UUID,
+    data: PurchasedProductsSchema,
+):
+    read_session = await ReadRouting.session_for_user(user_id, session, read_session)
+    purchased = await PurchasesService.check(read_session, user_id, data.product_ids)
+    return {"purchased": purchased}
+
+
 @orders_router.post("/{order_id}/confirm")
 async def confirm_order(
     session: SessionDep,
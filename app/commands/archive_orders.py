@@ -0,0 +1,60 @@
+"""Moves terminal orders older than N months into orders_archive.
+
+Orders are moved in batches, each in its own transaction. Monthly
+partitions left empty before the cutoff month are dropped afterwards.
+
+Usage:
+    python -m app.commands.archive_orders [--months 12] [--batch-size 1000] [--keep-partitions]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.core.database import async_session_factory, engine
+from app.services.archive_service import OrderArchiveService
+from app.services.partition_service import PartitionService
+
+logger = logging.getLogger(__name__)
+
+
+async def archive_orders(cutoff: datetime, batch_size: int) -> int:
+    archived = 0
+    while True:
+        async with async_session_factory() as session:
+            moved = await OrderArchiveService.archive_batch(session, cutoff, batch_size)
+            await session.commit()
+        archived += moved
+        if moved:
+            logger.info("archived %s orders", archived)
+        if moved < batch_size:
+            return archived
+
+
+async def main(months: int, batch_size: int, keep_partitions: bool) -> None:
+    current_month = PartitionService.month_start(datetime.now(timezone.utc))
+    cutoff = PartitionService.add_months(current_month, -months)
+    try:
+        archived = await archive_orders(cutoff, batch_size)
+        logger.info("done, %s orders created before %s archived", archived, cutoff.date())
+
+        if not keep_partitions:
+            async with async_session_factory() as session:
+                dropped = await PartitionService.drop_empty_partitions(session, cutoff)
+                await session.commit()
+            logger.info("dropped %s empty partitions: %s", len(dropped), ", ".join(dropped) or "-")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--months", type=int, default=settings.orders.ORDERS_ARCHIVE_AFTER_MONTHS)
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.orders.ORDERS_ARCHIVE_BATCH_SIZE
+    )
+    parser.add_argument("--keep-partitions", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.months, args.batch_size, args.keep_partitions))
@@ -0,0 +1,59 @@
+"""Rebuilds seller_daily_stats from live and archived orders.
+
+Days are rebuilt one month per transaction. Order writes wait on the
+rollup table while a month is being rebuilt, and then apply their own
+changes on top of it.
+
+Usage:
+    python -m app.commands.backfill_seller_stats [--from 2026-01-01] [--to 2026-10-18]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.database import async_session_factory, engine
+from app.services.partition_service import PartitionService
+from app.services.seller_stats_service import SellerStatsService
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill(start: date, end: date) -> int:
+    """Rebuilds the days in [`start`, `end`)."""
+    rebuilt = 0
+    month = PartitionService.month_start(SellerStatsService.day_start(start))
+    while month.date() < end:
+        next_month = PartitionService.add_months(month, 1)
+        chunk_start, chunk_end = max(month.date(), start), min(next_month.date(), end)
+        async with async_session_factory() as session:
+            rows = await SellerStatsService.rebuild(session, chunk_start, chunk_end)
+            await session.commit()
+        rebuilt += rows
+        logger.info("%s..%s: %s rows", chunk_start, chunk_end - timedelta(days=1), rows)
+        month = next_month
+    return rebuilt
+
+
+async def main(date_from: date | None, date_to: date | None) -> None:
+    try:
+        if date_from is None:
+            async with async_session_factory() as session:
+                date_from = await SellerStatsService.get_history_start(session)
+            if date_from is None:
+                logger.info("no orders, nothing to backfill")
+                return
+        date_to = date_to or datetime.now(timezone.utc).date()
+        rebuilt = await backfill(date_from, date_to + timedelta(days=1))
+        logger.info("done, %s rows for %s..%s", rebuilt, date_from, date_to)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    args = parser.parse_args()
+    asyncio.run(main(args.date_from, args.date_to))
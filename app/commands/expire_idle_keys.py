@@ -0,0 +1,49 @@
+"""Applies the configured TTL to cart and favorites keys that have none.
+
+Keys written before TTLs existed only get one on their next access; this
+command gives the rest (users that never come back) an expiry too.
+
+Usage:
+    python -m app.commands.expire_idle_keys [--chunk-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+
+from app.core.redis_client import redis_client, redis_storage
+from app.services import CartService, FavoritesService
+
+logger = logging.getLogger(__name__)
+
+
+async def expire_idle_keys(prefix: str, ttl_seconds: int, chunk_size: int) -> int:
+    updated = 0
+    async for keys in redis_storage.scan_keys(f"{prefix}:*", chunk_size):
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                # NX: only keys without an expiry, sliding TTLs are left untouched
+                pipe.expire(key, ttl_seconds, nx=True)
+            updated += sum(bool(result) for result in await pipe.execute())
+    return updated
+
+
+async def main(chunk_size: int) -> None:
+    try:
+        for prefix, ttl_seconds in (
+            (CartService.CART_KEY_PREFIX, CartService.CART_TTL_SECONDS),
+            (FavoritesService.FAVORITES_KEY_PREFIX, FavoritesService.FAVORITES_TTL_SECONDS),
+        ):
+            if not ttl_seconds:
+                continue
+            updated = await expire_idle_keys(prefix, ttl_seconds, chunk_size)
+            logger.info("%s: ttl set on %s keys", prefix, updated)
+    finally:
+        await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.chunk_size))
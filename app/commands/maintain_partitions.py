@@ -0,0 +1,37 @@
+"""Creates the monthly partitions of orders and order_items ahead of time.
+
+Run it at least monthly (e.g. from cron); rows of a month without a
+partition land in the default partition, which then blocks creating it.
+
+Usage:
+    python -m app.commands.maintain_partitions [--months-ahead 3]
+"""
+import argparse
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import async_session_factory, engine
+from app.services.partition_service import PartitionService
+
+logger = logging.getLogger(__name__)
+
+
+async def main(months_ahead: int) -> None:
+    try:
+        async with async_session_factory() as session:
+            created = await PartitionService.ensure_partitions(session, months_ahead)
+            await session.commit()
+        logger.info("created %s partitions: %s", len(created), ", ".join(created) or "-")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--months-ahead", type=int, default=settings.orders.ORDERS_PARTITIONS_AHEAD_MONTHS
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.months_ahead))
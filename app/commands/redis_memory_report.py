@@ -0,0 +1,96 @@
+"""Samples the Redis keyspace and reports memory per key prefix.
+
+Every key is counted (via SCAN); MEMORY USAGE and TTL are read for a
+random sample and extrapolated to the whole prefix.
+
+Usage:
+    python -m app.commands.redis_memory_report [--sample-rate 0.05] [--json]
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+
+from app.core.redis_client import redis_client, redis_storage
+
+
+@dataclass
+class PrefixReport:
+    keys: int = 0
+    sampled: int = 0
+    sampled_bytes: int = 0
+    sampled_without_ttl: int = 0
+
+    @property
+    def estimated_bytes(self) -> int:
+        if not self.sampled:
+            return 0
+        return int(self.sampled_bytes / self.sampled * self.keys)
+
+    def as_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "avg_bytes_per_key": self.sampled_bytes // self.sampled if self.sampled else 0,
+            "estimated_bytes": self.estimated_bytes,
+            "without_ttl_ratio": self.sampled_without_ttl / self.sampled if self.sampled else 0.0,
+        }
+
+
+async def build_report(sample_rate: float, chunk_size: int) -> dict[str, PrefixReport]:
+    reports: dict[str, PrefixReport] = defaultdict(PrefixReport)
+    async for keys in redis_storage.scan_keys("*", chunk_size):
+        sampled = []
+        for key in keys:
+            prefix = key.split(":", 1)[0]
+            reports[prefix].keys += 1
+            if random.random() < sample_rate:
+                sampled.append((prefix, key))
+        if not sampled:
+            continue
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for _, key in sampled:
+                pipe.memory_usage(key)
+                pipe.ttl(key)
+            values = await pipe.execute()
+
+        for (prefix, _), usage, ttl in zip(sampled, values[::2], values[1::2]):
+            if usage is None:
+                continue
+            report = reports[prefix]
+            report.sampled += 1
+            report.sampled_bytes += usage
+            if ttl == -1:
+                report.sampled_without_ttl += 1
+    return reports
+
+
+async def main(sample_rate: float, chunk_size: int, as_json: bool) -> None:
+    try:
+        reports = await build_report(sample_rate, chunk_size)
+    finally:
+        await redis_client.aclose()
+
+    ordered = sorted(reports.items(), key=lambda item: item[1].estimated_bytes, reverse=True)
+    if as_json:
+        print(json.dumps({prefix: report.as_dict() for prefix, report in ordered}, indent=2))
+        return
+
+    print(f"{'prefix':<20}{'keys':>12}{'avg bytes':>12}{'est. total':>16}{'no ttl':>9}")
+    for prefix, report in ordered:
+        data = report.as_dict()
+        print(
+            f"{prefix:<20}{report.keys:>12}{data['avg_bytes_per_key']:>12}"
+            f"{report.estimated_bytes:>16}{data['without_ttl_ratio']:>9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sample-rate", type=float, default=0.05)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.sample_rate, args.chunk_size, args.json))
@@ -0,0 +1,70 @@
+"""Builds the per-user purchased-products Redis sets from order_items and
+orders_archive.
+
+Usage:
+    python -m app.commands.warm_purchased_products [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select, func, union_all
+
+from app.core.config import settings
+from app.core.database import async_session_factory, engine
+from app.core.redis_client import redis_client, redis_storage
+from app.models.archive import ArchivedOrderModel
+from app.models.orders import OrderModel, OrderItemModel, PURCHASED_STATUSES
+from app.services import PurchasesService
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_purchased_products(batch_size: int) -> int:
+    purchases = union_all(
+        select(OrderModel.user_id, OrderItemModel.product_id)
+        .join(OrderItemModel, OrderItemModel.order_id == OrderModel.id)
+        .where(OrderModel.status.in_(PURCHASED_STATUSES)),
+        select(
+            ArchivedOrderModel.user_id,
+            func.unnest(ArchivedOrderModel.product_ids).label("product_id"),
+        ).where(ArchivedOrderModel.status.in_(PURCHASED_STATUSES)),
+    ).subquery("purchases")
+    stmt = select(
+        purchases.c.user_id, func.array_agg(func.distinct(purchases.c.product_id))
+    ).group_by(purchases.c.user_id)
+    ttl_seconds = settings.redis.PURCHASED_PRODUCTS_TTL_SECONDS
+
+    users = 0
+    async with async_session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            # merged into sets that already exist, so payments recorded while
+            # the command runs are kept
+            await redis_storage.backfill_sets(
+                [
+                    PurchasesService.backfill_entry(user_id, product_ids)
+                    for user_id, product_ids in rows
+                ],
+                ttl_seconds=ttl_seconds,
+            )
+            users += len(rows)
+            logger.info("warmed %s users", users)
+    return users
+
+
+async def main(batch_size: int) -> None:
+    try:
+        users = await warm_purchased_products(batch_size)
+        logger.info("done, %s users warmed", users)
+    finally:
+        await engine.dispose()
+        await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
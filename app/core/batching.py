@@ -0,0 +1,60 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class MicroBatcher(Generic[K]):
+    """Collects concurrently submitted keys and applies them as one batch.
+
+    A batch is flushed once it reaches `max_size` or `max_delay` seconds after
+    its first key arrived. `apply` returns the keys it accepted; every
+    submitter gets True or False for its own key, or the error of the batch.
+    """
+
+    def __init__(
+        self,
+        apply: Callable[[list[K]], Awaitable[set[K]]],
+        max_size: int,
+        max_delay: float,
+    ):
+        self._apply = apply
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._pending: list[tuple[K, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def submit(self, key: K) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((key, future))
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, batch: list[tuple[K, asyncio.Future]]) -> None:
+        try:
+            accepted = await self._apply(list(dict.fromkeys(key for key, _ in batch)))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in batch:
+            if not future.done():
+                future.set_result(key in accepted)
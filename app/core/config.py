@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import computed_field, BaseModel
 from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,6 +30,37 @@ class CORSConfig(Conf):
 
 class UrlsConfig(Conf):
     NGINX_URL: str = "http://nginx_gateway"
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    # requires the `http2` extra
+    HTTP2: bool = False
+    HTTP_CONNECT_TIMEOUT: float = 2.0
+    HTTP_READ_TIMEOUT: float = 5.0
+    HTTP_WRITE_TIMEOUT: float = 5.0
+    HTTP_POOL_TIMEOUT: float = 2.0
+
+
+class OrdersConfig(Conf):
+    ORDERS_BATCH_MAX_SIZE: int = 1000
+    # product-service calls spent finding the rejected orders of a batch
+    ORDERS_BATCH_STOCK_CHECKS_MAX: int = 32
+    ORDERS_PAGE_SIZE_DEFAULT: int = 50
+    ORDERS_PAGE_SIZE_MAX: int = 200
+    ORDER_CACHE_ENABLED: bool = True
+    ORDER_CACHE_TTL_SECONDS: int = 30
+    # monthly partitions kept ready ahead of the current month
+    ORDERS_PARTITIONS_AHEAD_MONTHS: int = 3
+    # terminal orders older than this move to orders_archive
+    ORDERS_ARCHIVE_AFTER_MONTHS: int = 12
+    ORDERS_ARCHIVE_BATCH_SIZE: int = 1000
+
+
+class StockCheckConfig(Conf):
+    STOCK_CHECK_COALESCE: bool = True
+    # one of: none, memory, redis
+    STOCK_CHECK_CACHE_BACKEND: str = "none"
+    STOCK_CHECK_CACHE_TTL_MS: int = 500
 
 
 class PostgresConfig(Conf):
@@ -37,6 +70,25 @@ class PostgresConfig(Conf):
     DB_ORDER_SERVICE_USER: str
     DB_ORDER_SERVICE_PASSWORD: str
     ECHO: bool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # seconds after which a connection is replaced; -1 never recycles
+    DB_POOL_RECYCLE: int = 1800
+    # costs a round trip per checkout, only worth it behind flaky networks
+    DB_POOL_PRE_PING: bool = False
+    # asyncpg prepared statements per connection; 0 behind pgbouncer in transaction mode
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # SQLAlchemy's cache of asyncpg prepared statement handles per connection
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # open the pool and prepare the hot statements at startup
+    DB_WARMUP: bool = True
+    # optional streaming replica serving the read endpoints; same credentials as the primary
+    DB_REPLICA_HOST: str | None = None
+    DB_REPLICA_PORT: int | None = None
+    # reads of just-written orders and users stay on the primary this long,
+    # so it should exceed the usual replication lag
+    DB_REPLICA_FRESHNESS_MS: int = 5000
 
     @computed_field
     @property
@@ -50,6 +102,19 @@ class PostgresConfig(Conf):
             path=self.DB_ORDER_SERVICE_NAME,
         )
 
+    @property
+    def POSTGRES_REPLICA_URL_ASYNC(self) -> MultiHostUrl | None:
+        if not self.DB_REPLICA_HOST:
+            return None
+        return MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.DB_ORDER_SERVICE_USER,
+            password=self.DB_ORDER_SERVICE_PASSWORD,
+            host=self.DB_REPLICA_HOST,
+            port=self.DB_REPLICA_PORT or self.DB_ORDER_SERVICE_PORT,
+            path=self.DB_ORDER_SERVICE_NAME,
+        )
+
 
 class RabbitConfig(Conf):
     PRODUCTS_ROUTING_KEY: str = "products"
@@ -58,13 +123,34 @@ class RabbitConfig(Conf):
     PRODUCTS_EXCHANGE: str = "products"
     ORDERS_ROUTING_KEY: str = "orders"
     ORDERS_RESERVED_ROUTING_KEY: str = "orders.reserved"
+    ORDERS_RESERVATION_FAILED_ROUTING_KEY: str = "orders.reservation_failed"
+    ORDERS_MAX_RETRIES: int = 5
+    ORDERS_RETRY_DELAY_MS: int = 5000
     RABBITMQ_URL: str
+    # channel qos: how many unacked messages a consumer may hold
+    RABBITMQ_PREFETCH_COUNT: int = 200
+    ORDERS_RESERVED_BATCHING: bool = True
+    ORDERS_RESERVED_BATCH_SIZE: int = 100
+    ORDERS_RESERVED_BATCH_TIMEOUT_MS: int = 50
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
 
 
 class RedisConfig(Conf):
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: str
+    # orjson and msgpack require the extra of the same name
+    REDIS_CODEC: Literal["json", "orjson", "msgpack"] = "json"
+    REDIS_TOLERANT_VALIDATION: bool = True
+    # store model lists as {"f": fields, "r": rows} instead of a list of objects
+    REDIS_COMPACT_LISTS: bool = False
+    # user ids per /cart/bulk or /favorites/bulk request; exports use /cart/stream
+    REDIS_BULK_MAX_USERS: int = 1000
+    # sliding expiry, renewed on every access; 0 disables it
+    CART_TTL_SECONDS: int = 30 * 24 * 60 * 60
+    FAVORITES_TTL_SECONDS: int = 180 * 24 * 60 * 60
+    PURCHASED_PRODUCTS_TTL_SECONDS: int = 7 * 24 * 60 * 60
 
     @property
     def REDIS_URL_ASYNC(self):
@@ -75,6 +161,25 @@ class RedisConfig(Conf):
             "decode_responses": True,
         }
 
+
+class MetricsConfig(Conf):
+    METRICS_ENABLED: bool = True
+    METRICS_NAMESPACE: str = "order_service"
+    # exporter of the FastStream worker, which has no HTTP app of its own
+    METRICS_WORKER_HOST: str = "0.0.0.0"
+    METRICS_WORKER_PORT: int = 9102
+
+
+class ProfilingConfig(Conf):
+    # Server-Timing header with sql/http/redis/rabbit time per request
+    PROFILING_SERVER_TIMING: bool = False
+    # share of requests run under cProfile; 0 disables profiling
+    PROFILING_SAMPLE_RATE: float = 0.0
+    # profiled requests slower than this are written to PROFILING_OUTPUT_DIR
+    PROFILING_SLOW_REQUEST_MS: int = 1000
+    PROFILING_OUTPUT_DIR: str = "profiles"
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -85,9 +190,13 @@ class Settings(BaseSettings):
     app: AppConfig = AppConfig()
     cors: CORSConfig = CORSConfig()
     urls: UrlsConfig = UrlsConfig()
+    orders: OrdersConfig = OrdersConfig()
+    stock_check: StockCheckConfig = StockCheckConfig()
     pg_database: PostgresConfig = PostgresConfig()
     rabbitmq: RabbitConfig = RabbitConfig()
     redis: RedisConfig = RedisConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    profiling: ProfilingConfig = ProfilingConfig()
 
 
 settings = Settings()
@@ -1,10 +1,48 @@
+import time
+
+from sqlalchemy import event
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import db_query_duration, db_pool_connections, db_pool_checkout_wait
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Records how long a checkout waited for a free connection, including
+    opening a new one when the pool grows."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - started)
+
+
+def build_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.pg_database.DB_POOL_SIZE,
+        max_overflow=settings.pg_database.DB_MAX_OVERFLOW,
+        pool_timeout=settings.pg_database.DB_POOL_TIMEOUT,
+        pool_recycle=settings.pg_database.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.pg_database.DB_POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": settings.pg_database.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.pg_database.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        },
+    )
 
 
-engine = create_async_engine(str(settings.pg_database.POSTGRES_URL_ASYNC))
+engine = build_engine(str(settings.pg_database.POSTGRES_URL_ASYNC))
+
+# without a configured replica, reads use the primary engine
+replica_url = settings.pg_database.POSTGRES_REPLICA_URL_ASYNC
+replica_engine = build_engine(str(replica_url)) if replica_url else engine
+replica_enabled = replica_engine is not engine
 
 async_session_factory = async_sessionmaker(
     engine,
@@ -12,6 +50,55 @@ async_session_factory = async_sessionmaker(
     autoflush=False,
 )
 
+read_session_factory = async_sessionmaker(
+    replica_engine,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 
 class Base(DeclarativeBase):
     pass
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _observe_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    db_query_duration.observe(time.perf_counter() - started, operation=operation)
+
+
+def _drop_query_timer(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+ENGINES = {"primary": engine, "replica": replica_engine} if replica_enabled else {"primary": engine}
+
+for _engine in ENGINES.values():
+    event.listen(_engine.sync_engine, "before_cursor_execute", _start_query_timer)
+    event.listen(_engine.sync_engine, "after_cursor_execute", _observe_query)
+    event.listen(_engine.sync_engine, "handle_error", _drop_query_timer)
+
+
+def _pool_connections() -> dict[tuple[str, ...], float]:
+    connections = {}
+    for name, pool_engine in ENGINES.items():
+        pool = pool_engine.pool
+        connections.update(
+            {
+                (name, "checked_out"): pool.checkedout(),
+                (name, "idle"): pool.checkedin(),
+                (name, "overflow"): max(pool.overflow(), 0),
+                (name, "size"): pool.size(),
+                (name, "capacity"): pool.size() + settings.pg_database.DB_MAX_OVERFLOW,
+            }
+        )
+    return connections
+
+
+db_pool_connections.add_collector(_pool_connections)
@@ -0,0 +1,69 @@
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import http_client_request_duration
+
+
+async def _start_request_timer(request: httpx.Request) -> None:
+    request.extensions["started"] = time.perf_counter()
+
+
+async def _observe_response(response: httpx.Response) -> None:
+    request = response.request
+    http_client_request_duration.observe(
+        time.perf_counter() - request.extensions["started"],
+        method=request.method,
+        path=request.url.path,
+        status=str(response.status_code),
+    )
+
+
+def build_http_client() -> httpx.AsyncClient:
+    urls = settings.urls
+    return httpx.AsyncClient(
+        base_url=urls.NGINX_URL,
+        http2=urls.HTTP2,
+        limits=httpx.Limits(
+            max_connections=urls.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=urls.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=urls.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=urls.HTTP_CONNECT_TIMEOUT,
+            read=urls.HTTP_READ_TIMEOUT,
+            write=urls.HTTP_WRITE_TIMEOUT,
+            pool=urls.HTTP_POOL_TIMEOUT,
+        ),
+        event_hooks={"request": [_start_request_timer], "response": [_observe_response]},
+    )
+
+
+class HttpClientManager:
+    """Owns the long-lived client used for calls to other services.
+
+    Started and stopped by the application lifespan, so every request reuses
+    the same keep-alive connection pool instead of opening a new one.
+    """
+
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("HTTP client is not started")
+        return self._client
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = build_http_client()
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_client = HttpClientManager()
@@ -0,0 +1,251 @@
+import logging
+import functools
+import os
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator, TypeVar
+
+import prometheus_client
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from prometheus_client.registry import Collector
+
+from app.core.config import settings
+from app.core.profiling import add_timing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+NAMESPACE = settings.metrics.METRICS_NAMESPACE
+
+# set for several uvicorn workers; prometheus_client then keeps the samples in
+# files shared by all processes, so any of them can answer a scrape
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+LabelValues = tuple[str, ...]
+T = TypeVar("T")
+
+metrics_registry = CollectorRegistry()
+
+
+class Histogram:
+    """prometheus_client Histogram that also adds observations to the
+    per-request timings of `component` and can time async functions."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        component: str | None = None,
+    ):
+        self._histogram = prometheus_client.Histogram(
+            name,
+            documentation,
+            labelnames,
+            namespace=NAMESPACE,
+            buckets=buckets,
+            registry=metrics_registry,
+        )
+        self.component = component
+
+    def observe(self, value: float, **labels: str) -> None:
+        (self._histogram.labels(**labels) if labels else self._histogram).observe(value)
+        if self.component is not None:
+            add_timing(self.component, value)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def timed(self, **labels: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+        """Decorator timing every call of an async function."""
+
+        def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs) -> T:
+                with self.time(**labels):
+                    return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+class CallbackGauge(Collector):
+    """Gauge computed at scrape time by the added collectors.
+
+    In multiprocess mode it reports the process answering the scrape.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = f"{NAMESPACE}_{name}" if NAMESPACE else name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._collectors: list[Callable[[], dict[LabelValues, float]]] = []
+        metrics_registry.register(self)
+
+    def add_collector(self, collect: Callable[[], dict[LabelValues, float]]) -> None:
+        self._collectors.append(collect)
+
+    def _family(self) -> GaugeMetricFamily:
+        return GaugeMetricFamily(self.name, self.documentation, labels=self.labelnames)
+
+    def describe(self) -> list[GaugeMetricFamily]:
+        return [self._family()]
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        family = self._family()
+        for collect in self._collectors:
+            try:
+                for labels, value in collect().items():
+                    family.add_metric([str(label) for label in labels], value)
+            except Exception:
+                logger.exception("Collecting %s failed", self.name)
+        yield family
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Latency of handled HTTP requests by route template.",
+    ("method", "route", "status"),
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "Latency of SQL statements by statement type.",
+    ("operation",),
+    component="sql",
+)
+db_pool_connections = CallbackGauge(
+    "db_pool_connections",
+    "Connections of the SQLAlchemy pools by engine and state.",
+    ("engine", "state"),
+)
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time a session waited to check a connection out of the pool.",
+)
+http_client_request_duration = Histogram(
+    "http_client_request_duration_seconds",
+    "Latency of outgoing HTTP requests until response headers.",
+    ("method", "path", "status"),
+    component="http",
+)
+rabbitmq_publish_duration = Histogram(
+    "rabbitmq_publish_duration_seconds",
+    "Latency of confirmed RabbitMQ publishes.",
+    ("routing_key",),
+    component="rabbit",
+)
+rabbitmq_consume_duration = Histogram(
+    "rabbitmq_consume_duration_seconds",
+    "Handling time of consumed RabbitMQ messages.",
+    ("queue", "outcome"),
+)
+redis_command_duration = Histogram(
+    "redis_command_duration_seconds",
+    "Latency of RedisStorage operations.",
+    ("operation",),
+    component="redis",
+)
+order_create_stage_duration = Histogram(
+    "order_create_stage_duration_seconds",
+    "Time spent in each stage of order creation.",
+    ("stage",),
+)
+service_cache_stats = CallbackGauge(
+    "service_cache_stats",
+    "Stats of the stock check coalescer and the order snapshot cache.",
+    ("cache", "stat"),
+)
+
+
+def _build_exposition_registry() -> CollectorRegistry:
+    if not MULTIPROCESS:
+        return metrics_registry
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    registry.register(db_pool_connections)
+    registry.register(service_cache_stats)
+    return registry
+
+
+exposition_registry = _build_exposition_registry()
+
+
+def render_metrics() -> bytes:
+    return generate_latest(exposition_registry)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording `http_request_duration` per route template.
+
+    Requests that match no route are labeled "unmatched" to keep the number of
+    series bounded.
+    """
+
+    def __init__(self, app, exclude_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status,
+            )
+
+
+class WorkerMetricsServer:
+    """prometheus_client's exporter thread for processes without an ASGI app,
+    i.e. the FastStream worker."""
+
+    def __init__(self, host: str, port: int):
+        self._host = host
+        self._port = port
+        self._server = None
+
+    async def start(self) -> None:
+        if self._server is None:
+            self._server, _ = prometheus_client.start_http_server(
+                self._port, self._host, registry=exposition_registry
+            )
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+worker_metrics_server = WorkerMetricsServer(
+    host=settings.metrics.METRICS_WORKER_HOST,
+    port=settings.metrics.METRICS_WORKER_PORT,
+)
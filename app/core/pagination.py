@@ -0,0 +1,20 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from app.exceptions import INVALID_CURSOR_EXCEPTION
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, TypeError):
+        raise INVALID_CURSOR_EXCEPTION
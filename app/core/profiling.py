@@ -0,0 +1,123 @@
+import asyncio
+import cProfile
+import logging
+import random
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ("sql", "http", "redis", "rabbit")
+
+
+@dataclass
+class RequestTimings:
+    """Time spent in each backend component while handling one request.
+
+    Concurrent calls (asyncio.gather) are summed, so a component can exceed
+    the wall time of the request.
+    """
+
+    seconds: dict[str, float] = field(default_factory=lambda: dict.fromkeys(COMPONENTS, 0.0))
+    counts: dict[str, int] = field(default_factory=lambda: dict.fromkeys(COMPONENTS, 0))
+
+    def add(self, component: str, seconds: float) -> None:
+        self.seconds[component] = self.seconds.get(component, 0.0) + seconds
+        self.counts[component] = self.counts.get(component, 0) + 1
+
+    def server_timing(self, total: float) -> str:
+        entries = [
+            f'{component};dur={self.seconds[component] * 1000:.2f};desc="{self.counts[component]} calls"'
+            for component in COMPONENTS
+            if self.counts.get(component)
+        ]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def add_timing(component: str, seconds: float) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(component, seconds)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware adding a `Server-Timing` header with the SQL, HTTP,
+    Redis and RabbitMQ time of each request, and writing cProfile dumps of
+    sampled requests slower than `slow_request_seconds`.
+
+    Only one request is profiled at a time: the interpreter allows a single
+    active profiler, and it records whatever else the event loop runs
+    meanwhile.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        server_timing: bool,
+        sample_rate: float,
+        slow_request_seconds: float,
+        output_dir: str,
+    ):
+        self.app = app
+        self.server_timing = server_timing
+        self.sample_rate = sample_rate
+        self.slow_request_seconds = slow_request_seconds
+        self.output_dir = Path(output_dir)
+        self._profiling = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if self.server_timing and message["type"] == "http.response.start":
+                header = timings.server_timing(time.perf_counter() - started)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header.encode())]
+            await send(message)
+
+        profiler = self._start_profiler()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+                elapsed = time.perf_counter() - started
+                if elapsed >= self.slow_request_seconds:
+                    await asyncio.to_thread(self._dump, profiler, scope, elapsed)
+
+    def _start_profiler(self) -> cProfile.Profile | None:
+        if self._profiling or not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # another profiler (e.g. a debugger) is active
+            return None
+        self._profiling = True
+        return profiler
+
+    def _dump(self, profiler: cProfile.Profile, scope, elapsed: float) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        path = self.output_dir / (
+            f"{datetime.now():%Y%m%d-%H%M%S-%f}-{scope['method']}-{slug}-{elapsed * 1000:.0f}ms.prof"
+        )
+        profiler.dump_stats(path)
+        logger.info("Slow request profile written to %s", path)
@@ -1,8 +1,14 @@
-from faststream.rabbit import RabbitExchange, RabbitQueue, ExchangeType, RabbitBroker
+from faststream.rabbit import Channel, RabbitExchange, RabbitQueue, ExchangeType, RabbitBroker
 
 from app.core.config import settings
 
-rabbit_broker = RabbitBroker(settings.rabbitmq.RABBITMQ_URL)
+rabbit_broker = RabbitBroker(
+    settings.rabbitmq.RABBITMQ_URL,
+    default_channel=Channel(
+        prefetch_count=settings.rabbitmq.RABBITMQ_PREFETCH_COUNT,
+        publisher_confirms=True,
+    ),
+)
 
 orders_exchange = RabbitExchange(
     name=settings.rabbitmq.ORDERS_ROUTING_KEY,
@@ -10,7 +16,67 @@ orders_exchange = RabbitExchange(
     durable=True,
 )
 
-orders_reserved_queue = RabbitQueue(
-    name=settings.rabbitmq.ORDERS_RESERVED_ROUTING_KEY,
+orders_dead_letter_exchange = RabbitExchange(
+    name=f"{settings.rabbitmq.ORDERS_ROUTING_KEY}.dlx",
+    type=ExchangeType.DIRECT,
     durable=True,
 )
+
+
+def build_consumer_queue(name: str) -> RabbitQueue:
+    """Queue whose rejected messages go to `<name>.dead` through the dead-letter exchange."""
+    return RabbitQueue(
+        name=name,
+        durable=True,
+        arguments={
+            "x-dead-letter-exchange": orders_dead_letter_exchange.name,
+            "x-dead-letter-routing-key": f"{name}.dead",
+        },
+    )
+
+
+def build_retry_queue(name: str) -> RabbitQueue:
+    """Consumer-less queue that holds a message for the retry delay, then
+    dead-letters it back to `name` through the default exchange."""
+    return RabbitQueue(
+        name=f"{name}.retry",
+        durable=True,
+        arguments={
+            "x-message-ttl": settings.rabbitmq.ORDERS_RETRY_DELAY_MS,
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": name,
+        },
+    )
+
+
+def build_dead_queue(name: str) -> RabbitQueue:
+    return RabbitQueue(name=f"{name}.dead", durable=True, routing_key=f"{name}.dead")
+
+
+orders_reserved_queue = build_consumer_queue(settings.rabbitmq.ORDERS_RESERVED_ROUTING_KEY)
+orders_reserved_retry_queue = build_retry_queue(settings.rabbitmq.ORDERS_RESERVED_ROUTING_KEY)
+orders_reserved_dead_queue = build_dead_queue(settings.rabbitmq.ORDERS_RESERVED_ROUTING_KEY)
+
+orders_reservation_failed_queue = build_consumer_queue(
+    settings.rabbitmq.ORDERS_RESERVATION_FAILED_ROUTING_KEY
+)
+orders_reservation_failed_retry_queue = build_retry_queue(
+    settings.rabbitmq.ORDERS_RESERVATION_FAILED_ROUTING_KEY
+)
+orders_reservation_failed_dead_queue = build_dead_queue(
+    settings.rabbitmq.ORDERS_RESERVATION_FAILED_ROUTING_KEY
+)
+
+
+async def declare_orders_topology() -> None:
+    """Declares the dead-letter exchange, dead-letter and retry queues.
+
+    These queues have no subscribers, so FastStream would not declare them.
+    """
+    await rabbit_broker.connect()
+    dead_letter_exchange = await rabbit_broker.declare_exchange(orders_dead_letter_exchange)
+    for dead_queue in (orders_reserved_dead_queue, orders_reservation_failed_dead_queue):
+        queue = await rabbit_broker.declare_queue(dead_queue)
+        await queue.bind(dead_letter_exchange, routing_key=dead_queue.routing_key)
+    for retry_queue in (orders_reserved_retry_queue, orders_reservation_failed_retry_queue):
+        await rabbit_broker.declare_queue(retry_queue)
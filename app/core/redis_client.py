@@ -1,8 +1,16 @@
 from redis import asyncio as redis
 
 from app.core.config import settings
-from app.interfaces import RedisStorage
+from app.interfaces import RedisStorage, get_codec
 
 
-redis_client = redis.Redis(**settings.redis.REDIS_URL_ASYNC)
-redis_storage = RedisStorage(redis_client)
+redis_codec = get_codec(settings.redis.REDIS_CODEC)
+redis_client = redis.Redis(
+    **{**settings.redis.REDIS_URL_ASYNC, "decode_responses": not redis_codec.binary}
+)
+redis_storage = RedisStorage(
+    redis_client,
+    codec=redis_codec,
+    tolerant_validation=settings.redis.REDIS_TOLERANT_VALIDATION,
+    compact_lists=settings.redis.REDIS_COMPACT_LISTS,
+)
@@ -12,3 +12,16 @@ REVIEW_NOT_FOUND_EXCEPTION = HTTPException(
 REVIEW_ALREADY_EXISTS_EXCEPTION = HTTPException(
     status_code=status.HTTP_409_CONFLICT, detail="User has already reviewed this product"
 )
+
+INVALID_CURSOR_EXCEPTION = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+)
+
+STOCK_NOT_CHECKED_EXCEPTION = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Stock not checked, too many orders of the batch were rejected",
+)
+
+ORDER_NOT_FOUND_EXCEPTION = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
+)
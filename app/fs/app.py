@@ -1,8 +1,32 @@
 from faststream import FastStream
 
-from app.core.rabbit_config import rabbit_broker
+from app.core.config import settings
+from app.core.metrics import worker_metrics_server
+from app.core.rabbit_config import rabbit_broker, declare_orders_topology
 from app.fs.routers import orders_router
+from app.services.warmup import warm_up_database
 
 app = FastStream(rabbit_broker)
 
 rabbit_broker.include_router(orders_router)
+
+
+@app.on_startup
+async def declare_topology():
+    await declare_orders_topology()
+
+
+@app.on_startup
+async def warm_up():
+    await warm_up_database(with_transitions=True)
+
+
+@app.on_startup
+async def start_metrics_server():
+    if settings.metrics.METRICS_ENABLED:
+        await worker_metrics_server.start()
+
+
+@app.after_shutdown
+async def stop_metrics_server():
+    await worker_metrics_server.stop()
@@ -1,10 +1,118 @@
-from faststream.rabbit import RabbitRouter
+import logging
+import time
+from typing import Awaitable, Callable
+from uuid import UUID
 
-from app.core.rabbit_config import orders_reserved_queue
+from faststream.exceptions import RejectMessage
+from faststream.rabbit import RabbitRouter, RabbitMessage, RabbitQueue
+
+from app.core.batching import MicroBatcher
+from app.core.config import settings
+from app.core.metrics import rabbitmq_consume_duration, rabbitmq_publish_duration
+from app.core.rabbit_config import (
+    rabbit_broker,
+    orders_reserved_queue,
+    orders_reserved_retry_queue,
+    orders_reservation_failed_queue,
+    orders_reservation_failed_retry_queue,
+)
 from app.services import OrderService
 
+logger = logging.getLogger(__name__)
+
+RETRY_COUNT_HEADER = "x-retry-count"
+
 orders_router = RabbitRouter()
 
+reservation_batcher = MicroBatcher(
+    OrderService.move_orders_to_reserved,
+    max_size=settings.rabbitmq.ORDERS_RESERVED_BATCH_SIZE,
+    max_delay=settings.rabbitmq.ORDERS_RESERVED_BATCH_TIMEOUT_MS / 1000,
+)
+
+
+def _parse_order_id(order_data: dict) -> UUID:
+    try:
+        return UUID(str(order_data.get("order_id")))
+    except ValueError:
+        logger.error("Malformed order event, dead-lettering: %s", order_data)
+        raise RejectMessage()
+
+
+async def _handle_order_event(
+    order_data: dict,
+    message: RabbitMessage,
+    apply: Callable[[UUID], Awaitable[bool]],
+    queue: RabbitQueue,
+    retry_queue: RabbitQueue,
+) -> None:
+    """Acks applied and stale events, delays transient failures through the
+    retry queue and dead-letters the event once its retries are used up."""
+    started = time.perf_counter()
+    outcome = "dead_lettered"
+    try:
+        outcome = await _apply_or_retry(order_data, message, apply, retry_queue)
+    finally:
+        rabbitmq_consume_duration.observe(
+            time.perf_counter() - started, queue=queue.name, outcome=outcome
+        )
+
+
+async def _apply_or_retry(
+    order_data: dict,
+    message: RabbitMessage,
+    apply: Callable[[UUID], Awaitable[bool]],
+    retry_queue: RabbitQueue,
+) -> str:
+    order_id = _parse_order_id(order_data)
+    try:
+        applied = await apply(order_id)
+    except Exception:
+        retries = int((message.headers or {}).get(RETRY_COUNT_HEADER, 0))
+        if retries >= settings.rabbitmq.ORDERS_MAX_RETRIES:
+            logger.exception("Order %s event failed %s times, dead-lettering", order_id, retries)
+            raise RejectMessage()
+
+        logger.exception("Order %s event failed, retry %s scheduled", order_id, retries + 1)
+        with rabbitmq_publish_duration.time(routing_key=retry_queue.name):
+            await rabbit_broker.publish(
+                order_data,
+                routing_key=retry_queue.name,
+                headers={RETRY_COUNT_HEADER: retries + 1},
+            )
+        return "retried"
+
+    if not applied:
+        # duplicate delivery or the order already moved on: nothing to do
+        logger.info("Order %s event is stale, acked without changes", order_id)
+        return "stale"
+    return "applied"
+
+
+async def _reserve(order_id: UUID) -> bool:
+    if settings.rabbitmq.ORDERS_RESERVED_BATCHING:
+        # resolves after the batch containing this order was committed
+        return await reservation_batcher.submit(order_id)
+    return order_id in await OrderService.move_orders_to_reserved([order_id])
+
+
+async def _fail_reservation(order_id: UUID) -> bool:
+    return order_id in await OrderService.move_orders_to_reservation_failed([order_id])
+
+
 @orders_router.subscriber(orders_reserved_queue)
-async def reserve_order(order_data: dict):
-    await OrderService.move_order_to_reserved(order_data)
+async def reserve_order(order_data: dict, message: RabbitMessage):
+    await _handle_order_event(
+        order_data, message, _reserve, orders_reserved_queue, orders_reserved_retry_queue
+    )
+
+
+@orders_router.subscriber(orders_reservation_failed_queue)
+async def fail_order_reservation(order_data: dict, message: RabbitMessage):
+    await _handle_order_event(
+        order_data,
+        message,
+        _fail_reservation,
+        orders_reservation_failed_queue,
+        orders_reservation_failed_retry_queue,
+    )
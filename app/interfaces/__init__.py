@@ -1,5 +1,8 @@
 __all__ = (
     "RedisStorage",
+    "Codec",
+    "get_codec",
 )
 
-from app.interfaces.redis_interface import RedisStorage
\ No newline at end of file
+from app.interfaces.codecs import Codec, get_codec
+from app.interfaces.redis_interface import RedisStorage
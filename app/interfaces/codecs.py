@@ -0,0 +1,83 @@
+import json
+from abc import ABC, abstractmethod
+from importlib import import_module
+from typing import Any
+
+
+def _import_extra(module: str):
+    try:
+        return import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"REDIS_CODEC={module} requires the {module!r} extra: "
+            f"pip install 'user-service[{module}]'"
+        ) from e
+
+
+class Codec(ABC):
+    name: str
+    # binary codecs need a Redis client created with decode_responses=False
+    binary: bool = False
+    decode_errors: tuple[type[Exception], ...] = (ValueError, TypeError)
+
+    @abstractmethod
+    def dumps(self, value: Any) -> str | bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data: str | bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    name = "json"
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    name = "orjson"
+
+    def __init__(self):
+        self._orjson = _import_extra("orjson")
+
+    def dumps(self, value: Any) -> bytes:
+        return self._orjson.dumps(value)
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    name = "msgpack"
+    binary = True
+
+    def __init__(self):
+        self._msgpack = _import_extra("msgpack")
+
+    def dumps(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: str | bytes) -> Any:
+        if isinstance(data, str):
+            raise ValueError("msgpack payload must be bytes")
+        return self._msgpack.unpackb(data, raw=False)
+
+
+CODECS: dict[str, type[Codec]] = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+
+def get_codec(name: str) -> Codec:
+    try:
+        codec_cls = CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown Redis codec {name!r}, expected one of {sorted(CODECS)}")
+    return codec_cls()
@@ -1,40 +1,245 @@
 import json
 from abc import ABC, abstractmethod
-from typing import Sequence, TypeVar
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Mapping, Sequence, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.core.metrics import redis_command_duration
+from app.interfaces.codecs import Codec, JsonCodec
 
 
 TModel = TypeVar("TModel", bound=BaseModel)
 
 
+@lru_cache(maxsize=None)
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
 class RedisInterface(ABC):
     @abstractmethod
-    async def get_model_list(self, key: str, schema: type[TModel]) -> list[TModel]:
+    async def get_model_list(
+        self,
+        key: str,
+        schema: type[TModel],
+        ttl_seconds: int | None = None,
+    ) -> list[TModel]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_model_list(
+        self,
+        key: str,
+        items: Sequence[BaseModel],
+        ttl_seconds: int | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_model_lists(self, keys: Sequence[str], schema: type[TModel]) -> list[list[TModel]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_hashes(self, keys: Sequence[str]) -> list[dict | Exception]:
         raise NotImplementedError
 
     @abstractmethod
-    async def set_model_list(self, key: str, items: Sequence[BaseModel]) -> None:
+    def scan_keys(self, pattern: str, chunk_size: int) -> AsyncIterator[list[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_json(self, key: str) -> Any | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_json(
+        self,
+        key: str,
+        value: Any,
+        ttl_ms: int | None = None,
+        nx: bool = False,
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_json_many(self, values: Mapping[str, Any], ttl_ms: int | None = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_set_membership(self, key: str, members: Sequence[str | int]) -> list[bool] | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_to_existing_set(
+        self,
+        key: str,
+        members: Sequence[str | int],
+        absent_marker: str | None = None,
+        absent_marker_ttl_ms: int = 0,
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def backfill_sets(
+        self,
+        sets: Sequence[tuple[str, str, Sequence[str | int]]],
+        ttl_seconds: int | None = None,
+    ) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_hash(self, key: str, ttl_seconds: int | None = None) -> dict[str, str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def replace_hash(
+        self,
+        key: str,
+        mapping: Mapping[str | int, str | int],
+        ttl_seconds: int | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def convert_model_list_to_hash(
+        self,
+        key: str,
+        schema: type[TModel],
+        to_mapping: Callable[[list[TModel]], Mapping[str | int, str | int]],
+        ttl_seconds: int | None = None,
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def increment_hash_field(
+        self,
+        key: str,
+        field: str | int,
+        amount: int,
+        ttl_seconds: int | None = None,
+    ) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_hash_fields(
+        self,
+        key: str,
+        *fields: str | int,
+        ttl_seconds: int | None = None,
+    ) -> int:
         raise NotImplementedError
 
 
 class RedisStorage(RedisInterface):
-    def __init__(self, client: Redis):
+    # SADD of ARGV[2..] in chunks; unpacking thousands of members at once
+    # overflows the Lua stack
+    _SADD_ARGV_CHUNKS = """
+    local function sadd_argv(key)
+        local added = 0
+        for first = 2, #ARGV, 1000 do
+            added = added + redis.call('SADD', key, unpack(ARGV, first, math.min(first + 999, #ARGV)))
+        end
+        return added
+    end
+    """
+
+    # SADD only when the set is already there, so a partial set is never created;
+    # otherwise KEYS[2], if given, marks the set as missing this write for ARGV[1] ms
+    _SADD_IF_EXISTS_SCRIPT = _SADD_ARGV_CHUNKS + """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        return sadd_argv(KEYS[1])
+    end
+    if KEYS[2] and tonumber(ARGV[1]) > 0 then
+        redis.call('SET', KEYS[2], 1, 'PX', ARGV[1])
+    end
+    return -1
+    """
+
+    # merges members read from the source of truth into the set KEYS[1], or
+    # creates it; skipped while the absent marker KEYS[2] says a write may be
+    # missing from what was read. The set is never deleted, so writes that
+    # already reached it are kept. ARGV[1] > 0 renews the key expiry
+    _BACKFILL_SET_SCRIPT = _SADD_ARGV_CHUNKS + """
+    if redis.call('EXISTS', KEYS[2]) == 1 then
+        return 0
+    end
+    sadd_argv(KEYS[1])
+    if tonumber(ARGV[1]) > 0 then
+        redis.call('EXPIRE', KEYS[1], ARGV[1])
+    end
+    return 1
+    """
+
+    # HINCRBY that drops the field once the value is no longer positive,
+    # ARGV[3] > 0 also renews the key expiry
+    _HINCRBY_OR_DELETE_SCRIPT = """
+    local value = redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+    if value <= 0 then
+        redis.call('HDEL', KEYS[1], ARGV[1])
+        value = 0
+    end
+    if tonumber(ARGV[3]) > 0 then
+        redis.call('EXPIRE', KEYS[1], ARGV[3])
+    end
+    return value
+    """
+
+    # replaces the string value ARGV[2] with a hash of the field/value pairs in
+    # ARGV[3..]; a no-op once the key holds anything else, e.g. after a
+    # concurrent conversion. ARGV[1] > 0 sets the key expiry
+    _STRING_TO_HASH_SCRIPT = """
+    if redis.call('TYPE', KEYS[1])['ok'] ~= 'string' or redis.call('GET', KEYS[1]) ~= ARGV[2] then
+        return 0
+    end
+    redis.call('DEL', KEYS[1])
+    if #ARGV > 2 then
+        redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+        if tonumber(ARGV[1]) > 0 then
+            redis.call('EXPIRE', KEYS[1], ARGV[1])
+        end
+    end
+    return 1
+    """
+
+    BULK_CHUNK_SIZE = 1000
+
+    def __init__(
+        self,
+        client: Redis,
+        codec: Codec | None = None,
+        tolerant_validation: bool = True,
+        compact_lists: bool = False,
+    ):
         self._client = client
+        self._codec = codec or JsonCodec()
+        self._tolerant_validation = tolerant_validation
+        self._compact_lists = compact_lists
 
-    async def get_model_list(self, key: str, schema: type[TModel]) -> list[TModel]:
-        redis_value = await self._client.get(key)
-        if not redis_value:
-            return []
+    @redis_command_duration.timed(operation="get_model_list")
+    async def get_model_list(
+        self,
+        key: str,
+        schema: type[TModel],
+        ttl_seconds: int | None = None,
+    ) -> list[TModel]:
+        """Reads a model list; with `ttl_seconds` the expiry slides forward (GETEX)."""
+        if ttl_seconds:
+            redis_value = await self._client.getex(key, ex=ttl_seconds)
+        else:
+            redis_value = await self._client.get(key)
+        return self._decode_model_list(redis_value, schema)
 
+    def _validate_list(self, raw_items: list, schema: type[TModel]) -> list[TModel]:
+        """Validates the whole list in one pass, falling back to per-item
+        validation (dropping invalid items) when tolerant validation is on."""
         try:
-            raw_items = json.loads(redis_value)
-        except json.JSONDecodeError:
-            return []
-
-        if not isinstance(raw_items, list):
-            return []
+            return _list_adapter(schema).validate_python(raw_items)
+        except ValidationError:
+            if not self._tolerant_validation:
+                raise
 
         items: list[TModel] = []
         for raw_item in raw_items:
@@ -44,6 +249,245 @@ class RedisStorage(RedisInterface):
                 continue
         return items
 
-    async def set_model_list(self, key: str, items: Sequence[BaseModel]) -> None:
-        payload = json.dumps([item.model_dump() for item in items], ensure_ascii=False)
-        await self._client.set(key, payload)
+    def _decode_model_list(self, redis_value, schema: type[TModel]) -> list[TModel]:
+        if not redis_value:
+            return []
+        try:
+            raw_items = self._codec.loads(redis_value)
+        except self._codec.decode_errors:
+            return []
+        if isinstance(raw_items, dict):
+            raw_items = self._expand_compact_list(raw_items)
+        if not isinstance(raw_items, list):
+            return []
+        return self._validate_list(raw_items, schema)
+
+    @staticmethod
+    def _expand_compact_list(compact: dict) -> list | None:
+        """Compact lists are stored as {"f": [field names], "r": [[values], ...]}."""
+        fields, rows = compact.get("f"), compact.get("r")
+        if not isinstance(fields, list) or not isinstance(rows, list):
+            return None
+        return [dict(zip(fields, row)) for row in rows if isinstance(row, list)]
+
+    @redis_command_duration.timed(operation="get_model_lists")
+    async def get_model_lists(self, keys: Sequence[str], schema: type[TModel]) -> list[list[TModel]]:
+        """MGET in chunks; the result is aligned with `keys`.
+
+        Bulk reads come from background jobs, so they never renew expiry."""
+        result: list[list[TModel]] = []
+        for start in range(0, len(keys), self.BULK_CHUNK_SIZE):
+            values = await self._client.mget(keys[start:start + self.BULK_CHUNK_SIZE])
+            result.extend(self._decode_model_list(value, schema) for value in values)
+        return result
+
+    @redis_command_duration.timed(operation="get_hashes")
+    async def get_hashes(self, keys: Sequence[str]) -> list[dict | Exception]:
+        """Pipelined HGETALL; keys holding another type yield their error in place."""
+        result: list[dict | Exception] = []
+        for start in range(0, len(keys), self.BULK_CHUNK_SIZE):
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key in keys[start:start + self.BULK_CHUNK_SIZE]:
+                    pipe.hgetall(key)
+                result.extend(await pipe.execute(raise_on_error=False))
+        return result
+
+    async def scan_keys(self, pattern: str, chunk_size: int) -> AsyncIterator[list[str]]:
+        """Walks the keyspace with SCAN so Redis is never blocked by one big call."""
+        cursor = 0
+        while True:
+            cursor, keys = await self._client.scan(cursor=cursor, match=pattern, count=chunk_size)
+            if keys:
+                yield [key.decode() if isinstance(key, bytes) else key for key in keys]
+            if not cursor:
+                break
+
+    @redis_command_duration.timed(operation="set_model_list")
+    async def set_model_list(
+        self,
+        key: str,
+        items: Sequence[BaseModel],
+        ttl_seconds: int | None = None,
+    ) -> None:
+        dumped = self._dump_list(items)
+        if self._compact_lists and dumped:
+            fields = list(dumped[0])
+            dumped = {"f": fields, "r": [[item.get(field) for field in fields] for item in dumped]}
+        await self._client.set(key, self._codec.dumps(dumped), ex=ttl_seconds or None)
+
+    @staticmethod
+    def _dump_list(items: Sequence[BaseModel]) -> list:
+        if not items:
+            return []
+        schema = type(items[0])
+        if all(type(item) is schema for item in items):
+            return _list_adapter(schema).dump_python(list(items), mode="json")
+        return [item.model_dump(mode="json") for item in items]
+
+    @redis_command_duration.timed(operation="get_json")
+    async def get_json(self, key: str) -> Any | None:
+        redis_value = await self._client.get(key)
+        if not redis_value:
+            return None
+
+        try:
+            return json.loads(redis_value)
+        except json.JSONDecodeError:
+            return None
+
+    @redis_command_duration.timed(operation="set_json")
+    async def set_json(
+        self,
+        key: str,
+        value: Any,
+        ttl_ms: int | None = None,
+        nx: bool = False,
+    ) -> None:
+        """With `nx` an existing key is left alone."""
+        payload = json.dumps(value, ensure_ascii=False)
+        await self._client.set(key, payload, px=ttl_ms, nx=nx)
+
+    @redis_command_duration.timed(operation="set_json_many")
+    async def set_json_many(self, values: Mapping[str, Any], ttl_ms: int | None = None) -> None:
+        """Pipelined SET of every key, in chunks."""
+        items = list(values.items())
+        for start in range(0, len(items), self.BULK_CHUNK_SIZE):
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in items[start:start + self.BULK_CHUNK_SIZE]:
+                    pipe.set(key, json.dumps(value, ensure_ascii=False), px=ttl_ms)
+                await pipe.execute()
+
+    @redis_command_duration.timed(operation="get_set_membership")
+    async def get_set_membership(self, key: str, members: Sequence[str | int]) -> list[bool] | None:
+        """Returns SMISMEMBER flags for `members`, or None when the set does not exist."""
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.exists(key)
+            pipe.smismember(key, list(members))
+            exists, flags = await pipe.execute()
+        if not exists:
+            return None
+        return [bool(flag) for flag in flags]
+
+    @redis_command_duration.timed(operation="add_to_existing_set")
+    async def add_to_existing_set(
+        self,
+        key: str,
+        members: Sequence[str | int],
+        absent_marker: str | None = None,
+        absent_marker_ttl_ms: int = 0,
+    ) -> bool:
+        """SADD when the set exists. Otherwise `absent_marker` is set, so that a
+        `backfill_sets` that read the members before this write skips the set."""
+        if not members:
+            return False
+        keys = [key, absent_marker] if absent_marker else [key]
+        added = await self._client.eval(
+            self._SADD_IF_EXISTS_SCRIPT, len(keys), *keys, absent_marker_ttl_ms, *members
+        )
+        return added != -1
+
+    @redis_command_duration.timed(operation="backfill_sets")
+    async def backfill_sets(
+        self,
+        sets: Sequence[tuple[str, str, Sequence[str | int]]],
+        ttl_seconds: int | None = None,
+    ) -> int:
+        """Merges `(key, absent_marker, members)` into the sets, creating the
+        missing ones, in one pipeline; returns how many were written."""
+        if not sets:
+            return 0
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, absent_marker, members in sets:
+                pipe.eval(
+                    self._BACKFILL_SET_SCRIPT, 2, key, absent_marker, ttl_seconds or 0, *members
+                )
+            written = await pipe.execute()
+        return sum(written)
+
+    @redis_command_duration.timed(operation="get_hash")
+    async def get_hash(self, key: str, ttl_seconds: int | None = None) -> dict[str, str]:
+        if not ttl_seconds:
+            return await self._client.hgetall(key)
+
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            pipe.expire(key, ttl_seconds)
+            value, _ = await pipe.execute()
+        return value
+
+    @redis_command_duration.timed(operation="replace_hash")
+    async def replace_hash(
+        self,
+        key: str,
+        mapping: Mapping[str | int, str | int],
+        ttl_seconds: int | None = None,
+    ) -> None:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if mapping:
+                pipe.hset(key, mapping=dict(mapping))
+                if ttl_seconds:
+                    pipe.expire(key, ttl_seconds)
+            await pipe.execute()
+
+    @redis_command_duration.timed(operation="convert_model_list_to_hash")
+    async def convert_model_list_to_hash(
+        self,
+        key: str,
+        schema: type[TModel],
+        to_mapping: Callable[[list[TModel]], Mapping[str | int, str | int]],
+        ttl_seconds: int | None = None,
+    ) -> bool:
+        """Replaces a model list stored as a string with the hash `to_mapping(items)`.
+
+        The swap only happens while the key still holds the string that was
+        read, so writes to an already converted hash are never overwritten.
+        Returns False when nothing was converted.
+        """
+        try:
+            redis_value = await self._client.get(key)
+        except ResponseError as e:
+            if "WRONGTYPE" not in str(e):
+                raise
+            return False
+        if redis_value is None:
+            return False
+        mapping = to_mapping(self._decode_model_list(redis_value, schema))
+        fields = [part for field_value in mapping.items() for part in field_value]
+        converted = await self._client.eval(
+            self._STRING_TO_HASH_SCRIPT, 1, key, ttl_seconds or 0, redis_value, *fields
+        )
+        return bool(converted)
+
+    @redis_command_duration.timed(operation="increment_hash_field")
+    async def increment_hash_field(
+        self,
+        key: str,
+        field: str | int,
+        amount: int,
+        ttl_seconds: int | None = None,
+    ) -> int:
+        """HINCRBY that removes the field when the result drops to zero or below."""
+        return int(
+            await self._client.eval(
+                self._HINCRBY_OR_DELETE_SCRIPT, 1, key, field, amount, ttl_seconds or 0
+            )
+        )
+
+    @redis_command_duration.timed(operation="delete_hash_fields")
+    async def delete_hash_fields(
+        self,
+        key: str,
+        *fields: str | int,
+        ttl_seconds: int | None = None,
+    ) -> int:
+        if not fields:
+            return 0
+        if not ttl_seconds:
+            return await self._client.hdel(key, *fields)
+
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.hdel(key, *fields)
+            pipe.expire(key, ttl_seconds)
+            deleted, _ = await pipe.execute()
+        return deleted
@@ -3,27 +3,55 @@ from contextlib import asynccontextmanager
 import uvicorn
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routers import main_router
+from app.core.http_client import http_client
 from app.core.rabbit_config import rabbit_broker
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, render_metrics, CONTENT_TYPE
+from app.core.profiling import ProfilingMiddleware
+from app.services.outbox_service import outbox_relay
+from app.services.warmup import warm_up_database
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logging.basicConfig(level=logging.INFO)
 
+    await warm_up_database(with_replica=True)
+    await http_client.start()
     await rabbit_broker.start()
+    await outbox_relay.start()
     yield
+    await outbox_relay.stop()
     await rabbit_broker.stop()
+    await http_client.stop()
 
 
 app = FastAPI(title="order-service", lifespan=lifespan)
 app.include_router(main_router)
 
 
+if settings.metrics.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def get_metrics():
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+
+if settings.profiling.PROFILING_SERVER_TIMING or settings.profiling.PROFILING_SAMPLE_RATE:
+    app.add_middleware(
+        ProfilingMiddleware,
+        server_timing=settings.profiling.PROFILING_SERVER_TIMING,
+        sample_rate=settings.profiling.PROFILING_SAMPLE_RATE,
+        slow_request_seconds=settings.profiling.PROFILING_SLOW_REQUEST_MS / 1000,
+        output_dir=settings.profiling.PROFILING_OUTPUT_DIR,
+    )
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors.CORS_ORIGINS,
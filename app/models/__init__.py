@@ -1,6 +1,12 @@
 __all__ = (
     "OrderModel",
-    "OrderItemModel"
+    "OrderItemModel",
+    "OutboxMessageModel",
+    "ArchivedOrderModel",
+    "SellerDailyStatsModel",
 )
 
 from app.models.orders import OrderModel, OrderItemModel
+from app.models.outbox import OutboxMessageModel
+from app.models.archive import ArchivedOrderModel
+from app.models.seller_stats import SellerDailyStatsModel
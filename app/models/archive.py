@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import DateTime, Float, Index, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.orders import OrderStatus
+
+
+class ArchivedOrderModel(Base):
+    """Terminal orders moved out of the partitioned tables, one row per order.
+
+    `items` holds [product_id, quantity, price, seller_id] rows and
+    `product_ids` keeps purchase checks answerable for archived orders.
+    """
+
+    __tablename__ = "orders_archive"
+    __table_args__ = (
+        Index("ix_orders_archive_user_id", "user_id", postgresql_include=["status"]),
+    )
+
+    id: Mapped[UUID] = mapped_column(primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(nullable=False)
+    status: Mapped[OrderStatus] = mapped_column(nullable=False)
+    total_amount: Mapped[float] = mapped_column(Float)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    items: Mapped[list[Any]] = mapped_column(JSONB, nullable=False)
+    product_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
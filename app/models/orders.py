@@ -1,7 +1,8 @@
+from datetime import datetime
 from enum import Enum
 from uuid import uuid4, UUID
 
-from sqlalchemy import Integer, Float
+from sqlalchemy import Integer, Float, Index, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -23,10 +24,46 @@ class OrderStatus(str, Enum):
     REFUNDED = "refunded"
 
 
+# statuses in which the user is considered to have bought the order items
+PURCHASED_STATUSES = (
+    OrderStatus.PAID,
+    OrderStatus.PREPARING,
+    OrderStatus.SHIPPING,
+    OrderStatus.DELIVERED,
+    OrderStatus.COMPLETED,
+    OrderStatus.REFUNDED,
+)
+
+# statuses without further transitions, moved to orders_archive once old enough
+TERMINAL_STATUSES = (
+    OrderStatus.RESERVATION_FAILED,
+    OrderStatus.COMPLETED,
+    OrderStatus.CANCELLED,
+    OrderStatus.REFUNDED,
+)
+
+# both tables are range-partitioned by month (see app/commands/maintain_partitions.py);
+# the partition key has to be part of the primary key
+PARTITIONED_TABLE_ARGS = {"postgresql_partition_by": "RANGE (created_at)"}
+
+
 class OrderModel(Base, TimestampMixin):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index(
+            "ix_orders_user_id_created_at",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_include=["status", "total_amount"],
+        ),
+        PARTITIONED_TABLE_ARGS,
+    )
 
     id: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), primary_key=True
+    )
     user_id: Mapped[UUID] = mapped_column(default=uuid4, nullable=False)
     status: Mapped[OrderStatus] = mapped_column(
         default=OrderStatus.PENDING, nullable=False
@@ -36,8 +73,32 @@ class OrderModel(Base, TimestampMixin):
 
 class OrderItemModel(Base, TimestampMixin):
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index(
+            "ix_order_items_order_id",
+            "order_id",
+            postgresql_include=["product_id", "quantity", "price", "seller_id"],
+        ),
+        Index(
+            "ix_order_items_seller_id_order_id",
+            "seller_id",
+            "order_id",
+            postgresql_include=["product_id", "quantity", "price"],
+        ),
+        Index("ix_order_items_product_id_order_id", "product_id", "order_id"),
+        Index(
+            "ix_order_items_seller_id_created_at",
+            "seller_id",
+            "created_at",
+            "order_id",
+        ),
+        PARTITIONED_TABLE_ARGS,
+    )
 
     id: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), primary_key=True
+    )
     order_id: Mapped[UUID] = mapped_column(default=uuid4, nullable=False)
     product_id: Mapped[int] = mapped_column(Integer, nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,28 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import Date, Float, Integer
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.orders import OrderStatus
+
+
+class SellerDailyStatsModel(Base):
+    """Per-seller rollup of orders by the UTC day they were created and their
+    current status.
+
+    `units` and `revenue` only cover the seller's own items of those orders.
+    Rows are kept up to date by `SellerStatsService` in the transactions that
+    create orders and change their status.
+    """
+
+    __tablename__ = "seller_daily_stats"
+
+    seller_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[OrderStatus] = mapped_column(primary_key=True)
+    orders_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(Float, nullable=False, default=0)
@@ -1,7 +1,11 @@
-from typing import List
+from datetime import datetime
+from typing import Annotated, List
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.models.orders import OrderStatus
 
 
 class OrderBaseSchema(BaseModel):
@@ -14,6 +18,30 @@ class OrderCreateSchema(BaseModel):
     order_items: List[OrderBaseSchema]
 
 
+OrdersBatchSchema = Annotated[
+    List[OrderCreateSchema],
+    Field(max_length=settings.orders.ORDERS_BATCH_MAX_SIZE),
+]
+
+
+class OrdersPageSchema(BaseModel):
+    limit: int | None = Field(default=None, ge=1)
+    cursor: str | None = None
+    status: OrderStatus | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+class PurchasedProductsSchema(BaseModel):
+    product_ids: List[int]
+
+
+class UserIdsSchema(BaseModel):
+    user_ids: List[UUID] = Field(
+        max_length=settings.redis.REDIS_BULK_MAX_USERS,
+        description="For exporting all carts use GET /cart/stream",
+    )
+
 
 class CartSchema(OrderBaseSchema):
     pass
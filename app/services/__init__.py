@@ -2,8 +2,10 @@ __all__ = (
     "OrderService",
     "CartService",
     "FavoritesService",
+    "PurchasesService",
 )
 
 from app.services.order_service import OrderService
 from app.services.cart_service import CartService
 from app.services.favorites_service import FavoritesService
+from app.services.purchases_service import PurchasesService
@@ -0,0 +1,82 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Select, and_, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.archive import ArchivedOrderModel
+from app.models.orders import PURCHASED_STATUSES, TERMINAL_STATUSES
+
+
+class OrderArchiveService:
+    """Moves old terminal orders from the partitioned tables into `orders_archive`."""
+
+    # one statement: lock a batch, delete its items and orders, insert one
+    # compact row per order; created_at is matched too, so only the
+    # partitions holding the batch are touched. An id already in the archive
+    # fails the statement, so its transaction rolls back and nothing is lost
+    _ARCHIVE_BATCH_SQL = text(
+        """
+        WITH batch AS (
+            SELECT id, created_at FROM orders
+            WHERE status::text = ANY(:statuses) AND created_at < :cutoff
+            ORDER BY created_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        ),
+        moved_items AS (
+            DELETE FROM order_items AS i USING batch AS b
+            WHERE i.order_id = b.id AND i.created_at = b.created_at
+            RETURNING i.order_id, i.product_id, i.quantity, i.price, i.seller_id
+        ),
+        moved_orders AS (
+            DELETE FROM orders AS o USING batch AS b
+            WHERE o.id = b.id AND o.created_at = b.created_at
+            RETURNING o.id, o.user_id, o.status, o.total_amount, o.created_at
+        ),
+        archived AS (
+            INSERT INTO orders_archive
+                (id, user_id, status, total_amount, created_at, archived_at, items, product_ids)
+            SELECT
+                o.id, o.user_id, o.status, o.total_amount, o.created_at, now(),
+                coalesce(
+                    jsonb_agg(jsonb_build_array(i.product_id, i.quantity, i.price, i.seller_id))
+                        FILTER (WHERE i.order_id IS NOT NULL),
+                    '[]'::jsonb
+                ),
+                coalesce(
+                    array_agg(DISTINCT i.product_id) FILTER (WHERE i.order_id IS NOT NULL),
+                    '{}'::integer[]
+                )
+            FROM moved_orders AS o
+            LEFT JOIN moved_items AS i ON i.order_id = o.id
+            GROUP BY o.id, o.user_id, o.status, o.total_amount, o.created_at
+        )
+        SELECT count(*) FROM moved_orders
+        """
+    )
+
+    @classmethod
+    async def archive_batch(cls, session: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+        """Archives up to `batch_size` terminal orders created before `cutoff`
+        and returns how many were moved; does not commit."""
+        result = await session.execute(
+            cls._ARCHIVE_BATCH_SQL,
+            {
+                # the enum is stored by name
+                "statuses": [order_status.name for order_status in TERMINAL_STATUSES],
+                "cutoff": cutoff,
+                "batch_size": batch_size,
+            },
+        )
+        return result.scalar_one()
+
+    @classmethod
+    def purchased_product_ids_stmt(cls, user_id: UUID) -> Select:
+        """Product ids of the user's archived purchases, for unions with the live tables."""
+        return select(func.unnest(ArchivedOrderModel.product_ids).label("product_id")).where(
+            and_(
+                ArchivedOrderModel.user_id == user_id,
+                ArchivedOrderModel.status.in_(PURCHASED_STATUSES),
+            )
+        )
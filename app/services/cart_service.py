@@ -1,20 +1,124 @@
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
 from uuid import UUID
 
+from redis.exceptions import ResponseError
+
+from app.core.config import settings
 from app.core.redis_client import redis_storage
 from app.schemas import CartSchema
 
+T = TypeVar("T")
+
 
 class CartService:
+    """Carts are Redis hashes `cart:{user_id}` mapping product_id to quantity.
+
+    Carts written by older versions as one JSON string are converted to a
+    hash the first time they are touched.
+    """
+
     CART_KEY_PREFIX = "cart"
+    CART_TTL_SECONDS = settings.redis.CART_TTL_SECONDS
+    # a legacy cart can be rewritten as JSON by an old instance mid-rollout
+    LEGACY_CART_ATTEMPTS = 3
 
     @classmethod
     def _build_key(cls, user_id: UUID) -> str:
         return f"{cls.CART_KEY_PREFIX}:{user_id}"
 
+    @staticmethod
+    def _to_mapping(products: list[CartSchema]) -> dict[int, int]:
+        mapping: dict[int, int] = {}
+        for product in products:
+            mapping[product.product_id] = mapping.get(product.product_id, 0) + product.quantity
+        return {product_id: quantity for product_id, quantity in mapping.items() if quantity > 0}
+
+    @classmethod
+    async def _migrate_legacy_cart(cls, key: str) -> None:
+        """Converts atomically; when a concurrent request converted the cart
+        first, this is a no-op and that request's hash is kept."""
+        await redis_storage.convert_model_list_to_hash(
+            key, CartSchema, cls._to_mapping, ttl_seconds=cls.CART_TTL_SECONDS
+        )
+
+    @classmethod
+    async def _run(cls, key: str, operation: Callable[[], Awaitable[T]]) -> T:
+        for _ in range(cls.LEGACY_CART_ATTEMPTS):
+            try:
+                return await operation()
+            except ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+            await cls._migrate_legacy_cart(key)
+        return await operation()
+
     @classmethod
     async def get(cls, user_id: UUID) -> list[CartSchema]:
-        return await redis_storage.get_model_list(cls._build_key(user_id), CartSchema)
+        key = cls._build_key(user_id)
+        cart = await cls._run(
+            key, lambda: redis_storage.get_hash(key, ttl_seconds=cls.CART_TTL_SECONDS)
+        )
+        return cls._from_hash(cart)
+
+    @staticmethod
+    def _from_hash(cart: dict) -> list[CartSchema]:
+        return [
+            CartSchema(product_id=int(product_id), quantity=int(quantity))
+            for product_id, quantity in cart.items()
+        ]
+
+    @classmethod
+    async def get_many(cls, user_ids: list[UUID]) -> dict[UUID, list[CartSchema]]:
+        keys = [cls._build_key(user_id) for user_id in user_ids]
+        carts = await redis_storage.get_hashes(keys)
+        result: dict[UUID, list[CartSchema]] = {}
+        for user_id, cart in zip(user_ids, carts):
+            if isinstance(cart, Exception):
+                result[user_id] = await cls.get(user_id)
+            else:
+                result[user_id] = cls._from_hash(cart)
+        return result
+
+    @classmethod
+    async def iterate_all(cls, chunk_size: int) -> AsyncIterator[dict[UUID, list[CartSchema]]]:
+        prefix_length = len(cls.CART_KEY_PREFIX) + 1
+        async for keys in redis_storage.scan_keys(f"{cls.CART_KEY_PREFIX}:*", chunk_size):
+            user_ids = []
+            for key in keys:
+                try:
+                    user_ids.append(UUID(key[prefix_length:]))
+                except ValueError:
+                    continue
+            yield await cls.get_many(user_ids)
 
     @classmethod
     async def set(cls, user_id: UUID, products: list[CartSchema]) -> None:
-        await redis_storage.set_model_list(cls._build_key(user_id), products)
+        await redis_storage.replace_hash(
+            cls._build_key(user_id),
+            cls._to_mapping(products),
+            ttl_seconds=cls.CART_TTL_SECONDS,
+        )
+
+    @classmethod
+    async def add_item(cls, user_id: UUID, product: CartSchema) -> int:
+        return await cls.increment(user_id, product.product_id, product.quantity)
+
+    @classmethod
+    async def increment(cls, user_id: UUID, product_id: int, delta: int) -> int:
+        key = cls._build_key(user_id)
+        return await cls._run(
+            key,
+            lambda: redis_storage.increment_hash_field(
+                key, product_id, delta, ttl_seconds=cls.CART_TTL_SECONDS
+            ),
+        )
+
+    @classmethod
+    async def remove_item(cls, user_id: UUID, product_id: int) -> None:
+        key = cls._build_key(user_id)
+        await cls._run(
+            key,
+            lambda: redis_storage.delete_hash_fields(
+                key, product_id, ttl_seconds=cls.CART_TTL_SECONDS
+            ),
+        )
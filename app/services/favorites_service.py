@@ -1,11 +1,13 @@
 from uuid import UUID
 
+from app.core.config import settings
 from app.core.redis_client import redis_storage
 from app.schemas import FavoriteSchema
 
 
 class FavoritesService:
     FAVORITES_KEY_PREFIX = "favorites"
+    FAVORITES_TTL_SECONDS = settings.redis.FAVORITES_TTL_SECONDS
 
     @classmethod
     def _build_key(cls, user_id: UUID) -> str:
@@ -13,8 +15,18 @@ class FavoritesService:
 
     @classmethod
     async def get(cls, user_id: UUID) -> list[FavoriteSchema]:
-        return await redis_storage.get_model_list(cls._build_key(user_id), FavoriteSchema)
+        return await redis_storage.get_model_list(
+            cls._build_key(user_id), FavoriteSchema, ttl_seconds=cls.FAVORITES_TTL_SECONDS
+        )
 
     @classmethod
     async def set(cls, user_id: UUID, products: list[FavoriteSchema]) -> None:
-        await redis_storage.set_model_list(cls._build_key(user_id), products)
+        await redis_storage.set_model_list(
+            cls._build_key(user_id), products, ttl_seconds=cls.FAVORITES_TTL_SECONDS
+        )
+
+    @classmethod
+    async def get_many(cls, user_ids: list[UUID]) -> dict[UUID, list[FavoriteSchema]]:
+        keys = [cls._build_key(user_id) for user_id in user_ids]
+        favorites = await redis_storage.get_model_lists(keys, FavoriteSchema)
+        return dict(zip(user_ids, favorites))
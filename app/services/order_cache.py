@@ -0,0 +1,125 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import service_cache_stats
+from app.core.redis_client import redis_storage
+from app.interfaces import RedisStorage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OrderCacheStats:
+    hits: int = 0
+    misses: int = 0
+    hit_seconds: float = 0.0
+    miss_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "avg_hit_ms": self.hit_seconds * 1000 / self.hits if self.hits else 0.0,
+            "avg_miss_ms": self.miss_seconds * 1000 / self.misses if self.misses else 0.0,
+        }
+
+
+class OrderSnapshotCache:
+    """Read-through Redis cache of order snapshots for status polling.
+
+    A snapshot is stored as a compact JSON array
+    `[id, user_id, status, total_amount, created_at]`.
+
+    Writers `store` the snapshot after each commit. Read-through fills only
+    create missing keys, so a fill loaded before a transition never replaces
+    the snapshot the transition stored. While Redis is unavailable orders are
+    read from the database.
+    """
+
+    ORDER_KEY_PREFIX = "order"
+
+    def __init__(self, *, enabled: bool, ttl_seconds: int, storage: RedisStorage):
+        self.enabled = enabled and ttl_seconds > 0
+        self.ttl_seconds = ttl_seconds
+        self.stats = OrderCacheStats()
+        self._storage = storage
+
+    @classmethod
+    def _build_key(cls, order_id: UUID) -> str:
+        return f"{cls.ORDER_KEY_PREFIX}:{order_id}"
+
+    @staticmethod
+    def to_snapshot(order) -> list:
+        return [
+            str(order.id),
+            str(order.user_id),
+            order.status.value,
+            order.total_amount,
+            order.created_at.isoformat(),
+        ]
+
+    @staticmethod
+    def from_snapshot(snapshot: list) -> dict:
+        order_id, user_id, order_status, total_amount, created_at = snapshot
+        return {
+            "id": order_id,
+            "user_id": user_id,
+            "status": order_status,
+            "total_amount": total_amount,
+            "created_at": created_at,
+        }
+
+    async def get_or_load(self, order_id: UUID, load: Callable[[], Awaitable]) -> dict:
+        """Returns the cached snapshot, or loads the order row and caches it."""
+        started = time.perf_counter()
+        if self.enabled:
+            try:
+                snapshot = await self._storage.get_json(self._build_key(order_id))
+            except RedisError:
+                logger.warning("Reading the cached order %s failed", order_id, exc_info=True)
+                snapshot = None
+            if snapshot is not None:
+                self.stats.hits += 1
+                self.stats.hit_seconds += time.perf_counter() - started
+                return self.from_snapshot(snapshot)
+
+        order = await load()
+        snapshot = self.to_snapshot(order)
+        if self.enabled:
+            try:
+                await self._storage.set_json(
+                    self._build_key(order_id), snapshot, ttl_ms=self.ttl_seconds * 1000, nx=True
+                )
+            except RedisError:
+                logger.warning("Caching the order %s failed", order_id, exc_info=True)
+        self.stats.misses += 1
+        self.stats.miss_seconds += time.perf_counter() - started
+        return self.from_snapshot(snapshot)
+
+    async def store(self, order) -> None:
+        await self.store_snapshot(order.id, self.to_snapshot(order))
+
+    async def store_snapshot(self, order_id: UUID, snapshot: list) -> None:
+        if self.enabled:
+            await self._storage.set_json(
+                self._build_key(order_id), snapshot, ttl_ms=self.ttl_seconds * 1000
+            )
+
+
+order_cache = OrderSnapshotCache(
+    enabled=settings.orders.ORDER_CACHE_ENABLED,
+    ttl_seconds=settings.orders.ORDER_CACHE_TTL_SECONDS,
+    storage=redis_storage,
+)
+
+service_cache_stats.add_collector(
+    lambda: {("order_snapshot", stat): value for stat, value in order_cache.stats.as_dict().items()}
+)
@@ -1,19 +1,43 @@
+import asyncio
+import json
 import logging
 from collections import defaultdict
-from uuid import UUID
+from datetime import datetime
+from typing import Awaitable
+from uuid import UUID, uuid4
 
 import httpx
 from fastapi import status, HTTPException
 
-from sqlalchemy import select, update, and_, func
+from sqlalchemy import (
+    select,
+    insert,
+    and_,
+    func,
+    tuple_,
+    cast,
+    literal_column,
+    true,
+    Text,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import async_session_factory
-from app.core.rabbit_config import rabbit_broker
-from app.exceptions import PRODUCT_NOT_FOUND_EXCEPTION
+from app.core.http_client import http_client
+from app.core.metrics import order_create_stage_duration
+from app.core.pagination import encode_cursor, decode_cursor
+from app.exceptions import PRODUCT_NOT_FOUND_EXCEPTION, STOCK_NOT_CHECKED_EXCEPTION
 from app.models.orders import OrderModel, OrderStatus, OrderItemModel
-from app.schemas import OrderCreateSchema
+from app.models.seller_stats import SellerDailyStatsModel
+from app.schemas import OrderCreateSchema, OrdersPageSchema
+from app.services.order_cache import order_cache
+from app.services.order_state_machine import OrderStateMachine
+from app.services.outbox_service import OutboxService, outbox_relay
+from app.services.purchases_service import PurchasesService
+from app.services.read_routing import ReadRouting
+from app.services.seller_stats_service import SellerStatsService
+from app.services.stock_coalescer import stock_check_coalescer
 
 logger = logging.getLogger(__name__)
 
@@ -48,27 +72,236 @@ class OrderService:
     async def create_order(cls, session: AsyncSession, order_data: OrderCreateSchema):
         logger.info("create_order")
 
-        stock_response = await cls.check_products_stock(order_data)
+        with order_create_stage_duration.time(stage="stock_check"):
+            stock_response = await cls.check_products_stock(order_data)
         logger.info("products in stock")
 
-        order = OrderModel(
-            user_id=order_data.user_id,
-            status=OrderStatus.PENDING,
-            total_amount=stock_response.get("total_amount", 0),
+        with order_create_stage_duration.time(stage="insert"):
+            order_id, created_at = (
+                await session.execute(
+                    insert(OrderModel)
+                    .values(
+                        id=uuid4(),
+                        user_id=order_data.user_id,
+                        status=OrderStatus.PENDING,
+                        total_amount=stock_response.get("total_amount"),
+                    )
+                    .returning(OrderModel.id, OrderModel.created_at)
+                )
+            ).one()
+
+            item_rows = cls._build_order_item_rows(order_id, stock_response.get("products"))
+            if item_rows:
+                # executemany with a list of dicts goes through the multi-row insert path
+                await session.execute(insert(OrderItemModel), item_rows)
+                await SellerStatsService.record_created(
+                    session, item_rows, {order_id: created_at}
+                )
+
+        with order_create_stage_duration.time(stage="outbox"):
+            await cls.reserve_products(session, order_id, order_data.order_items)
+
+        with order_create_stage_duration.time(stage="commit"):
+            await session.commit()
+        outbox_relay.notify()
+        # a failure after the commit must not make the client retry and duplicate the order
+        await cls._best_effort(
+            "marking order as written",
+            ReadRouting.mark_written(order_ids=[order_id], user_ids=[order_data.user_id]),
         )
-        session.add(order)
-        await session.flush()
+        return {"status": "processing", "order_id": order_id}
 
-        await cls.reserve_products(order.id, order_data.order_items)
+    @classmethod
+    async def create_orders_batch(
+        cls,
+        session: AsyncSession,
+        orders_data: list[OrderCreateSchema],
+    ) -> list[dict]:
+        logger.info("create_orders_batch: %s orders", len(orders_data))
+        stock_results = await cls._check_batch_stock(orders_data)
+
+        results: list[dict] = []
+        order_rows: list[dict] = []
+        item_rows: list[dict] = []
+        reservations: list[tuple[UUID, list]] = []
+        for index, (order_data, products) in enumerate(zip(orders_data, stock_results)):
+            if isinstance(products, HTTPException):
+                results.append({"index": index, "ok": False, "detail": products.detail})
+                continue
+
+            order_id = uuid4()
+            order_rows.append(
+                {
+                    "id": order_id,
+                    "user_id": order_data.user_id,
+                    "status": OrderStatus.PENDING,
+                    "total_amount": cls._order_total(products),
+                }
+            )
+            item_rows.extend(cls._build_order_item_rows(order_id, products))
+            reservations.append((order_id, order_data.order_items))
+            results.append({"index": index, "ok": True, "order_id": order_id})
+
+        if order_rows:
+            created_at_by_order_id = dict(
+                (
+                    await session.execute(
+                        insert(OrderModel).returning(OrderModel.id, OrderModel.created_at),
+                        order_rows,
+                    )
+                ).all()
+            )
+            if item_rows:
+                await session.execute(insert(OrderItemModel), item_rows)
+                await SellerStatsService.record_created(
+                    session, item_rows, created_at_by_order_id
+                )
+            await OutboxService.enqueue_many(
+                session,
+                [
+                    (
+                        settings.rabbitmq.PRODUCTS_RESERVE_ROUTING_KEY,
+                        cls._build_reservation_payload(order_id, items),
+                    )
+                    for order_id, items in reservations
+                ],
+            )
+            await session.commit()
+            outbox_relay.notify()
+            await cls._best_effort(
+                "marking orders as written",
+                ReadRouting.mark_written(
+                    order_ids=[row["id"] for row in order_rows],
+                    user_ids=[row["user_id"] for row in order_rows],
+                ),
+            )
 
-        for order_item in stock_response.get("products"):
-            if order_item.get("seller_id"):
-                order_item["seller_id"] = UUID(order_item["seller_id"])
-            order_item_model = OrderItemModel(**order_item, order_id=order.id)
-            session.add(order_item_model)
+        return results
 
-        await session.commit()
-        return {"status": "processing", "order_id": order.id}
+    @staticmethod
+    def _order_total(products: list[dict] | None) -> float:
+        """Order total from the priced order lines; the batch stock check
+        only returns a total for the whole batch."""
+        return sum((product.get("price") or 0) * product["quantity"] for product in products or [])
+
+    @staticmethod
+    def _price_order_items(
+        order_data: OrderCreateSchema,
+        products_by_id: dict[int, dict],
+    ) -> list[dict] | HTTPException:
+        if any(item.product_id not in products_by_id for item in order_data.order_items):
+            return PRODUCT_NOT_FOUND_EXCEPTION
+        return [
+            {
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "price": products_by_id[item.product_id].get("price"),
+                "seller_id": products_by_id[item.product_id].get("seller_id"),
+            }
+            for item in order_data.order_items
+        ]
+
+    @staticmethod
+    def _products_by_id(stock_response: dict) -> dict[int, dict]:
+        return {
+            product["product_id"]: product for product in stock_response.get("products") or []
+        }
+
+    @classmethod
+    async def _check_batch_stock(
+        cls,
+        orders_data: list[OrderCreateSchema],
+    ) -> list[list[dict] | HTTPException]:
+        """Returns the priced order lines for every order, or the error for that order.
+
+        The whole batch is checked with one request. Only when it is rejected
+        the batch is bisected to find out which orders failed; any error other
+        than a rejection aborts the batch.
+        """
+        all_items = [item for order_data in orders_data for item in order_data.order_items]
+        try:
+            stock_response = await stock_check_coalescer.check(
+                all_items, cls._request_products_stock
+            )
+        except HTTPException as e:
+            if e.status_code != status.HTTP_400_BAD_REQUEST:
+                raise
+            if len(orders_data) == 1:
+                return [e]
+            return await cls._check_stock_bisecting(orders_data)
+
+        products_by_id = cls._products_by_id(stock_response)
+        return [cls._price_order_items(order_data, products_by_id) for order_data in orders_data]
+
+    @staticmethod
+    def _halves(start: int, end: int) -> list[tuple[int, int]]:
+        # pushed onto a stack, so the first half is checked first
+        middle = (start + end) // 2
+        return [(middle, end), (start, middle)]
+
+    @classmethod
+    async def _check_stock_bisecting(
+        cls,
+        orders_data: list[OrderCreateSchema],
+    ) -> list[list[dict] | HTTPException]:
+        """Splits a rejected batch in halves and checks each half together
+        with the items of the orders accepted before it, so the accepted
+        orders never exceed the stock combined. A passing half is accepted
+        whole, a rejected one is split again down to single orders.
+
+        At most `ORDERS_BATCH_STOCK_CHECKS_MAX` checks are made; orders left
+        undecided then fail with `STOCK_NOT_CHECKED_EXCEPTION`. Stock can
+        still change before the reservation, which stays the final check.
+        """
+        results: list[list[dict] | HTTPException | None] = [None] * len(orders_data)
+        accepted_items: list = []
+        checks_left = settings.orders.ORDERS_BATCH_STOCK_CHECKS_MAX
+        ranges = cls._halves(0, len(orders_data))
+        while ranges:
+            start, end = ranges.pop()
+            if not checks_left:
+                for index in range(start, end):
+                    results[index] = STOCK_NOT_CHECKED_EXCEPTION
+                continue
+            checks_left -= 1
+
+            chunk = orders_data[start:end]
+            try:
+                stock_response = await stock_check_coalescer.check(
+                    accepted_items + [item for order_data in chunk for item in order_data.order_items],
+                    cls._request_products_stock,
+                )
+            except HTTPException as e:
+                if e.status_code != status.HTTP_400_BAD_REQUEST:
+                    raise
+                if end - start == 1:
+                    results[start] = e
+                else:
+                    ranges.extend(cls._halves(start, end))
+                continue
+
+            products_by_id = cls._products_by_id(stock_response)
+            for index, order_data in enumerate(chunk, start):
+                products = cls._price_order_items(order_data, products_by_id)
+                if not isinstance(products, HTTPException):
+                    accepted_items.extend(order_data.order_items)
+                results[index] = products
+        return results
+
+    @staticmethod
+    def _build_order_item_rows(order_id: UUID, products: list[dict]) -> list[dict]:
+        rows = []
+        for order_item in products or []:
+            seller_id = order_item.get("seller_id")
+            rows.append(
+                {
+                    **order_item,
+                    "id": uuid4(),
+                    "order_id": order_id,
+                    "seller_id": UUID(seller_id) if seller_id else None,
+                }
+            )
+        return rows
 
     @classmethod
     async def check_products_stock(
@@ -77,158 +310,239 @@ class OrderService:
     ) -> dict:
         logger.info("check_products_stock")
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{settings.urls.NGINX_URL}/products/stock",
-                    json={"items": order_data.model_dump().get("order_items")},
-                    headers={"Content-Type": "application/json"},
-                )
+        return await stock_check_coalescer.check(
+            order_data.order_items, cls._request_products_stock
+        )
 
-                response.raise_for_status()
-                result = response.json()
-                logger.info("result: %s", result)
+    @classmethod
+    async def _request_products_stock(cls, items: list[dict]) -> dict:
+        try:
+            response = await http_client.client.post(
+                "/products/stock",
+                json={"items": items},
+                headers={"Content-Type": "application/json"},
+            )
 
-                if not result.get("ok"):
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Products not in stock",
-                    )
+            response.raise_for_status()
+            result = response.json()
+            logger.info("result: %s", result)
 
-                return result
-            except httpx.TimeoutException:
-                logger.exception("Product service timeout")
-                raise HTTPException(
-                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-                    detail="Product service timeout",
-                )
-            except httpx.HTTPStatusError as e:
-                logger.exception(f"Product service error: {e.response.status_code}")
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"Product service error: {e.response.status_code}",
-                )
-            except Exception as e:
-                logger.exception(f"Unexpected error: {str(e)}")
+            if not result.get("ok"):
                 raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"Unexpected error: {str(e)}",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Products not in stock",
                 )
 
+            return result
+        except HTTPException:
+            raise
+        except httpx.TimeoutException:
+            logger.exception("Product service timeout")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Product service timeout",
+            )
+        except httpx.HTTPStatusError as e:
+            logger.exception(f"Product service error: {e.response.status_code}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Product service error: {e.response.status_code}",
+            )
+        except Exception as e:
+            logger.exception(f"Unexpected error: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Unexpected error: {str(e)}",
+            )
+
     @classmethod
-    async def reserve_products(cls, order_id: UUID, items: list):
-        payload = {
+    async def reserve_products(cls, session: AsyncSession, order_id: UUID, items: list):
+        await OutboxService.enqueue(
+            session,
+            settings.rabbitmq.PRODUCTS_RESERVE_ROUTING_KEY,
+            cls._build_reservation_payload(order_id, items),
+        )
+
+    @staticmethod
+    def _build_reservation_payload(order_id: UUID, items: list) -> dict:
+        return {
             "order_id": str(order_id),
             "type": "reserve_products",
             "sender": "order-service",
-            "items": items
+            "items": [item.model_dump(mode="json") for item in items],
         }
-        await rabbit_broker.publish(payload, routing_key=settings.rabbitmq.PRODUCTS_RESERVE_ROUTING_KEY)
-
-    @classmethod
-    async def get_order_status_by_id(cls, session: AsyncSession, order_id: UUID) -> OrderStatus | None:
-        stmt = select(OrderModel).where(OrderModel.id == order_id)
-        result = await session.scalar(stmt)
-        if not result:
-            return None
-        return result.status
 
     @classmethod
-    async def move_order_to_reserved(cls, order_data: dict):
+    async def move_orders_to_reserved(cls, order_ids: list[UUID]) -> set[UUID]:
+        """Moves the pending orders among `order_ids` to RESERVED; returns their ids."""
         async with async_session_factory() as session:
-            order_id = order_data.get("order_id")
+            orders = await OrderStateMachine.transition_many(
+                session, order_ids, OrderStatus.RESERVED
+            )
+            await session.commit()
 
-            order_status = await cls.get_order_status_by_id(session, order_id)
-            if order_status != OrderStatus.PENDING or not order_status:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Order is not pending"
-                )
+        # the transitions are committed; a failure here would have the message redelivered
+        await cls._best_effort(
+            "caching orders", asyncio.gather(*(order_cache.store(order) for order in orders))
+        )
+        await cls._best_effort(
+            "marking orders as written",
+            ReadRouting.mark_written(
+                order_ids=[order.id for order in orders],
+                user_ids=[order.user_id for order in orders],
+            ),
+        )
+        return {order.id for order in orders}
 
-            stmt = (
-                update(OrderModel)
-                .where(
-                    and_(
-                        OrderModel.id == order_id,
-                        OrderModel.status == OrderStatus.PENDING,
-                    )
-                )
-                .values({"status": OrderStatus.RESERVED})
+    @classmethod
+    async def move_orders_to_reservation_failed(cls, order_ids: list[UUID]) -> set[UUID]:
+        async with async_session_factory() as session:
+            orders = await OrderStateMachine.transition_many(
+                session, order_ids, OrderStatus.RESERVATION_FAILED
             )
-            await session.execute(stmt)
             await session.commit()
 
+        # the transitions are committed; a failure here would have the message redelivered
+        await cls._best_effort(
+            "caching orders", asyncio.gather(*(order_cache.store(order) for order in orders))
+        )
+        await cls._best_effort(
+            "marking orders as written",
+            ReadRouting.mark_written(
+                order_ids=[order.id for order in orders],
+                user_ids=[order.user_id for order in orders],
+            ),
+        )
+        return {order.id for order in orders}
+
     @classmethod
     async def confirm_order(cls, session: AsyncSession, order_id: UUID):
-        order_status = await cls.get_order_status_by_id(session, order_id)
-        if order_status == OrderStatus.PAID:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Order already paid"
-            )
+        await OrderStateMachine.transition(session, order_id, OrderStatus.PAID)
+        order = await OrderStateMachine.transition(session, order_id, OrderStatus.PREPARING)
+        await OutboxService.enqueue(
+            session,
+            settings.rabbitmq.PRODUCTS_DELETE_ROUTING_KEY,
+            {"order_id": str(order_id)},
+        )
+        await session.commit()
+        outbox_relay.notify()
+        # the order is committed and a retry would fail on PREPARING -> PAID,
+        # so the cache updates after the commit must not fail the request
+        await cls._best_effort("caching order", order_cache.store(order))
+        await cls._best_effort(
+            "marking order as written",
+            ReadRouting.mark_written(order_ids=[order.id], user_ids=[order.user_id]),
+        )
+        await cls._best_effort(
+            "recording purchases", PurchasesService.record_order(session, order_id)
+        )
 
-        if order_status != OrderStatus.RESERVED:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Order is not reserver"
-            )
+    @staticmethod
+    async def _best_effort(action: str, update: Awaitable) -> None:
+        try:
+            await update
+        except Exception:
+            logger.exception("%s failed after commit", action.capitalize())
 
-        stmt = (
-            update(OrderModel)
-            .where(
-                and_(
-                    OrderModel.id == order_id,
-                    OrderModel.status == OrderStatus.RESERVED,
-                )
-            )
-            .values({"status": OrderStatus.PAID})
-        )
+    @classmethod
+    async def get_order_by_id(
+        cls,
+        session: AsyncSession,
+        order_id: UUID,
+        primary_session: AsyncSession | None = None,
+    ) -> dict:
+        """`primary_session` is retried when `session` (a replica) misses the order."""
 
-        await session.execute(stmt)
-        await session.commit()
+        async def load_order():
+            order = await cls.load_order(session, order_id)
+            if not order and primary_session is not None and primary_session is not session:
+                order = await cls.load_order(primary_session, order_id)
+            if not order:
+                raise PRODUCT_NOT_FOUND_EXCEPTION
+            return order
 
-        await cls.move_order_to_preparing(session, order_id)
+        return await order_cache.get_or_load(order_id, load_order)
 
-        payload = {"order_id": order_id}
-        await rabbit_broker.publish(payload, routing_key=settings.rabbitmq.PRODUCTS_DELETE_ROUTING_KEY)
+    @classmethod
+    async def load_order(cls, session: AsyncSession, order_id: UUID) -> OrderModel | None:
+        """The database read behind `get_order_by_id`, without the cache."""
+        return await session.scalar(select(OrderModel).where(OrderModel.id == order_id))
+
+    @staticmethod
+    def _page_size(page: OrdersPageSchema) -> int:
+        return min(
+            page.limit or settings.orders.ORDERS_PAGE_SIZE_DEFAULT,
+            settings.orders.ORDERS_PAGE_SIZE_MAX,
+        )
 
     @classmethod
-    async def move_order_to_preparing(cls, session: AsyncSession, order_id: UUID):
-        order_status = await cls.get_order_status_by_id(session, order_id)
-        if order_status == OrderStatus.PREPARING:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Order already prepared"
+    def _apply_page(cls, stmt, page: OrdersPageSchema, created_at_column, id_column):
+        """Adds date-range and keyset conditions on (created_at, id), newest first.
+
+        One extra row is fetched to know whether there is a next page.
+        """
+        if page.created_from:
+            stmt = stmt.where(created_at_column >= page.created_from)
+        if page.created_to:
+            stmt = stmt.where(created_at_column < page.created_to)
+        if page.cursor:
+            cursor_created_at, cursor_id = decode_cursor(page.cursor)
+            stmt = stmt.where(
+                tuple_(created_at_column, id_column) < tuple_(cursor_created_at, cursor_id),
+                # redundant with the row comparison, but lets the planner prune partitions
+                created_at_column <= cursor_created_at,
             )
+        return stmt.order_by(created_at_column.desc(), id_column.desc()).limit(
+            cls._page_size(page) + 1
+        )
 
-        if order_status != OrderStatus.PAID:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Order not paid"
-            )
+    @classmethod
+    def _next_cursor(cls, rows: list, page: OrdersPageSchema) -> str | None:
+        if len(rows) <= cls._page_size(page):
+            return None
+        last = rows[cls._page_size(page) - 1]
+        return encode_cursor(last.created_at, last.id)
 
-        stmt = (
-            update(OrderModel)
-            .where(OrderModel.id == order_id)
-            .values({"status": OrderStatus.PREPARING})
-        )
-        await session.execute(stmt)
-        await session.commit()
+    @staticmethod
+    def _created_at_range(rows: list) -> tuple[datetime, datetime]:
+        created_at = [row.created_at for row in rows]
+        return min(created_at), max(created_at)
 
     @classmethod
-    async def get_order_by_id(cls, session: AsyncSession, order_id: UUID) -> OrderModel:
-        stmt = select(OrderModel).where(OrderModel.id == order_id)
-        order = await session.scalar(stmt)
-        if not order:
-            raise PRODUCT_NOT_FOUND_EXCEPTION
-        return order
+    async def _get_order_items(
+        cls,
+        session: AsyncSession,
+        order_ids: list[UUID],
+        created_at_range: tuple[datetime, datetime],
+        seller_id: UUID | None = None,
+    ):
+        """Items share their order's created_at, so bounding it to the page's
+        range only scans the order_items partitions of those months."""
+        items_stmt = (
+            select(
+                OrderItemModel.order_id,
+                OrderItemModel.product_id,
+                OrderItemModel.quantity,
+                OrderItemModel.price,
+                OrderItemModel.seller_id,
+            )
+            .where(
+                OrderItemModel.order_id.in_(order_ids),
+                OrderItemModel.created_at.between(*created_at_range),
+            )
+        )
+        if seller_id is not None:
+            items_stmt = items_stmt.where(OrderItemModel.seller_id == seller_id)
+        return (await session.execute(items_stmt)).all()
 
     @classmethod
     async def get_orders_by_user_id(
         cls,
         session: AsyncSession,
         user_id: UUID,
-    ) -> list[dict]:
+        page: OrdersPageSchema | None = None,
+    ) -> dict:
+        page = page or OrdersPageSchema()
         orders_stmt = (
             select(
                 OrderModel.id,
@@ -238,42 +552,63 @@ class OrderService:
                 OrderModel.created_at,
             )
             .where(OrderModel.user_id == user_id)
-            .order_by(OrderModel.created_at.desc())
         )
+        if page.status:
+            orders_stmt = orders_stmt.where(OrderModel.status == page.status)
+        orders_stmt = cls._apply_page(orders_stmt, page, OrderModel.created_at, OrderModel.id)
         order_rows = (await session.execute(orders_stmt)).all()
 
+        next_cursor = cls._next_cursor(order_rows, page)
+        order_rows = order_rows[: cls._page_size(page)]
         if not order_rows:
-            return []
+            return {"orders": [], "next_cursor": None}
 
-        order_ids = [row.id for row in order_rows]
-        items_stmt = (
-            select(
-                OrderItemModel.order_id,
-                OrderItemModel.product_id,
-                OrderItemModel.quantity,
-                OrderItemModel.price,
-                OrderItemModel.seller_id,
-            )
-            .where(OrderItemModel.order_id.in_(order_ids))
+        item_rows = await cls._get_order_items(
+            session, [row.id for row in order_rows], cls._created_at_range(order_rows)
         )
-        item_rows = (await session.execute(items_stmt)).all()
 
-        return cls._build_orders_payload(order_rows, item_rows)
+        return {
+            "orders": cls._build_orders_payload(order_rows, item_rows),
+            "next_cursor": next_cursor,
+        }
 
     @classmethod
     async def get_orders_by_seller_id(
         cls,
         session: AsyncSession,
         seller_id: UUID,
-    ) -> list[dict]:
-        order_ids_stmt = (
-            select(OrderItemModel.order_id)
+        page: OrdersPageSchema | None = None,
+    ) -> dict:
+        page = page or OrdersPageSchema()
+        # order_items.created_at equals the order's created_at (same transaction),
+        # so the page is walked on the (seller_id, created_at, order_id) index
+        page_stmt = (
+            select(
+                OrderItemModel.order_id.label("id"),
+                OrderItemModel.created_at,
+            )
             .where(OrderItemModel.seller_id == seller_id)
             .distinct()
         )
-        order_ids = list((await session.scalars(order_ids_stmt)).all())
-        if not order_ids:
-            return []
+        if page.status:
+            page_stmt = page_stmt.join(
+                OrderModel,
+                and_(
+                    OrderModel.id == OrderItemModel.order_id,
+                    OrderModel.created_at == OrderItemModel.created_at,
+                ),
+            ).where(OrderModel.status == page.status)
+        page_stmt = cls._apply_page(
+            page_stmt, page, OrderItemModel.created_at, OrderItemModel.order_id
+        )
+        page_rows = (await session.execute(page_stmt)).all()
+
+        next_cursor = cls._next_cursor(page_rows, page)
+        page_rows = page_rows[: cls._page_size(page)]
+        if not page_rows:
+            return {"orders": [], "next_cursor": None}
+        order_ids = [row.id for row in page_rows]
+        created_at_range = cls._created_at_range(page_rows)
 
         orders_stmt = (
             select(
@@ -283,29 +618,129 @@ class OrderService:
                 OrderModel.total_amount,
                 OrderModel.created_at,
             )
-            .where(OrderModel.id.in_(order_ids))
-            .order_by(OrderModel.created_at.desc())
+            .where(
+                OrderModel.id.in_(order_ids),
+                OrderModel.created_at.between(*created_at_range),
+            )
+            .order_by(OrderModel.created_at.desc(), OrderModel.id.desc())
         )
         order_rows = (await session.execute(orders_stmt)).all()
 
-        items_stmt = (
+        item_rows = await cls._get_order_items(session, order_ids, created_at_range, seller_id)
+
+        return {
+            "orders": cls._build_orders_payload(order_rows, item_rows),
+            "next_cursor": next_cursor,
+        }
+
+    @classmethod
+    async def get_orders_by_seller_id_json(
+        cls,
+        session: AsyncSession,
+        seller_id: UUID,
+        page: OrdersPageSchema | None = None,
+    ) -> bytes:
+        """Same page as `get_orders_by_seller_id` plus the count, as ready JSON bytes.
+
+        Postgres builds one JSON document per order (items aggregated with
+        json_agg) and the total count comes from the seller rollup in the same
+        statement, so the response is assembled from the database's text
+        without any dicts.
+        """
+        page = page or OrdersPageSchema()
+        page_stmt = (
             select(
-                OrderItemModel.order_id,
-                OrderItemModel.product_id,
-                OrderItemModel.quantity,
-                OrderItemModel.price,
-                OrderItemModel.seller_id,
+                OrderItemModel.order_id.label("id"),
+                OrderItemModel.created_at,
+            )
+            .where(OrderItemModel.seller_id == seller_id)
+            .distinct()
+        )
+        if page.status:
+            page_stmt = page_stmt.join(
+                OrderModel,
+                and_(
+                    OrderModel.id == OrderItemModel.order_id,
+                    OrderModel.created_at == OrderItemModel.created_at,
+                ),
+            ).where(OrderModel.status == page.status)
+        page_ids = cls._apply_page(
+            page_stmt, page, OrderItemModel.created_at, OrderItemModel.order_id
+        ).subquery("page_ids")
+
+        items_json = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        func.json_build_object(
+                            "product_id", OrderItemModel.product_id,
+                            "quantity", OrderItemModel.quantity,
+                            "price", OrderItemModel.price,
+                            "seller_id", OrderItemModel.seller_id,
+                        )
+                    ),
+                    literal_column("'[]'::json"),
+                )
             )
             .where(
                 and_(
-                    OrderItemModel.order_id.in_(order_ids),
+                    OrderItemModel.order_id == OrderModel.id,
+                    OrderItemModel.created_at == OrderModel.created_at,
                     OrderItemModel.seller_id == seller_id,
                 )
             )
+            .correlate(OrderModel)
+            .scalar_subquery()
+        )
+        order_json = func.json_build_object(
+            "id", OrderModel.id,
+            "user_id", OrderModel.user_id,
+            # the enum is stored by name, the API exposes the lowercase value
+            "status", func.lower(cast(OrderModel.status, Text)),
+            "total_amount", OrderModel.total_amount,
+            "created_at", OrderModel.created_at,
+            "order_items", items_json,
+        )
+        orders_page = (
+            select(
+                OrderModel.id,
+                OrderModel.created_at,
+                cast(order_json, Text).label("doc"),
+            )
+            .join(
+                page_ids,
+                and_(
+                    page_ids.c.id == OrderModel.id,
+                    page_ids.c.created_at == OrderModel.created_at,
+                ),
+            )
+            .subquery("orders_page")
+        )
+        orders_count = (
+            select(func.sum(SellerDailyStatsModel.orders_count).label("total"))
+            .where(SellerDailyStatsModel.seller_id == seller_id)
+            .subquery("orders_count")
         )
-        item_rows = (await session.execute(items_stmt)).all()
+        stmt = (
+            select(
+                orders_count.c.total.label("orders_count"),
+                orders_page.c.id,
+                orders_page.c.created_at,
+                orders_page.c.doc,
+            )
+            .select_from(orders_count.outerjoin(orders_page, true()))
+            .order_by(orders_page.c.created_at.desc(), orders_page.c.id.desc())
+        )
+        rows = (await session.execute(stmt)).all()
 
-        return cls._build_orders_payload(order_rows, item_rows)
+        order_rows = [row for row in rows if row.id is not None]
+        next_cursor = cls._next_cursor(order_rows, page)
+        docs = ",".join(row.doc for row in order_rows[: cls._page_size(page)])
+        return (
+            f'{{"orders_count":{int(rows[0].orders_count or 0)},'
+            f'"orders":[{docs}],'
+            f'"next_cursor":{json.dumps(next_cursor)}}}'
+        ).encode()
 
     @classmethod
     async def get_orders_count_by_seller_id(
@@ -313,31 +748,5 @@ class OrderService:
         session: AsyncSession,
         seller_id: UUID,
     ) -> int:
-        stmt = (
-            select(func.count(func.distinct(OrderItemModel.order_id)))
-            .where(OrderItemModel.seller_id == seller_id)
-        )
-        orders_count = await session.scalar(stmt)
-        return int(orders_count or 0)
-
-    # TODO: оптимизировать
-    @classmethod
-    async def has_user_purchased_product(
-        cls,
-        session: AsyncSession,
-        user_id: UUID,
-        product_id: int,
-    ) -> bool:
-        stmt = (
-            select(OrderModel.id)
-            .where(OrderModel.user_id == user_id)
-        )
-        order_ids = list((await session.scalars(stmt)).all())
-
-        stmt = (
-            select(OrderItemModel.product_id)
-            .where(OrderItemModel.order_id.in_(order_ids))
-        )
-        product_ids = list((await session.scalars(stmt)).all())
-
-        return product_id in product_ids
+        """Read from the seller rollup, so archived orders are counted too."""
+        return await SellerStatsService.get_orders_count(session, seller_id)
@@ -0,0 +1,130 @@
+from uuid import UUID
+
+from fastapi import status, HTTPException
+from sqlalchemy import select, update, and_, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.exceptions import ORDER_NOT_FOUND_EXCEPTION
+from app.models.orders import OrderModel, OrderStatus
+from app.services.seller_stats_service import SellerStatsService
+
+
+class OrderStateMachine:
+    """Allowed order status transitions and the single-statement way to apply them.
+
+    Transitions do not commit, so several of them (e.g. PAID -> PREPARING)
+    can be applied in one transaction and committed once by the caller.
+    The seller rollup is updated in the same transaction. The updated order
+    row is returned so callers can refresh caches from it.
+    """
+
+    TRANSITIONS: dict[OrderStatus, frozenset[OrderStatus]] = {
+        OrderStatus.PENDING: frozenset(
+            {OrderStatus.RESERVED, OrderStatus.RESERVATION_FAILED, OrderStatus.CANCELLED}
+        ),
+        OrderStatus.RESERVED: frozenset(
+            {OrderStatus.PAID, OrderStatus.PAYMENT_FAILED, OrderStatus.CANCELLED}
+        ),
+        OrderStatus.RESERVATION_FAILED: frozenset(),
+        OrderStatus.PAID: frozenset({OrderStatus.PREPARING, OrderStatus.REFUNDED}),
+        OrderStatus.PAYMENT_FAILED: frozenset({OrderStatus.PAID, OrderStatus.CANCELLED}),
+        OrderStatus.PREPARING: frozenset({OrderStatus.SHIPPING, OrderStatus.REFUNDED}),
+        OrderStatus.SHIPPING: frozenset({OrderStatus.DELIVERED}),
+        OrderStatus.DELIVERED: frozenset({OrderStatus.COMPLETED, OrderStatus.REFUNDED}),
+        OrderStatus.COMPLETED: frozenset({OrderStatus.REFUNDED}),
+        OrderStatus.CANCELLED: frozenset(),
+        OrderStatus.REFUNDED: frozenset(),
+    }
+
+    @classmethod
+    def can_transition(cls, source: OrderStatus, target: OrderStatus) -> bool:
+        return target in cls.TRANSITIONS[source]
+
+    @classmethod
+    def allowed_sources(cls, target: OrderStatus) -> list[OrderStatus]:
+        return [source for source, targets in cls.TRANSITIONS.items() if target in targets]
+
+    @classmethod
+    def _transition_stmt(cls, condition, target: OrderStatus):
+        """Updates the matching orders that allow the transition and returns
+        them with their `previous_status`.
+
+        The rows are locked in a subquery first, because an UPDATE can only
+        return the new values of the row it changes.
+        """
+        previous = (
+            select(OrderModel.id, OrderModel.created_at, OrderModel.status)
+            .where(condition, OrderModel.status.in_(cls.allowed_sources(target)))
+            .with_for_update()
+            .subquery("previous")
+        )
+        return (
+            update(OrderModel)
+            .where(
+                and_(
+                    OrderModel.id == previous.c.id,
+                    OrderModel.created_at == previous.c.created_at,
+                )
+            )
+            .values({"status": target})
+            .returning(
+                OrderModel.id,
+                OrderModel.user_id,
+                OrderModel.status,
+                OrderModel.total_amount,
+                OrderModel.created_at,
+                previous.c.status.label("previous_status"),
+            )
+        )
+
+    @classmethod
+    async def transition(
+        cls,
+        session: AsyncSession,
+        order_id: UUID,
+        target: OrderStatus,
+    ) -> Row:
+        stmt = cls._transition_stmt(OrderModel.id == order_id, target)
+        order = (await session.execute(stmt)).one_or_none()
+        if order is None:
+            await cls._raise_invalid_transition(session, order_id, target)
+        await SellerStatsService.record_transitions(session, [order])
+        return order
+
+    @classmethod
+    async def transition_many(
+        cls,
+        session: AsyncSession,
+        order_ids: list[UUID],
+        target: OrderStatus,
+    ) -> list[Row]:
+        """Applies the transition to every order that allows it, in one statement.
+
+        Orders missing from the returned rows were not in an allowed status.
+        """
+        if not order_ids:
+            return []
+        stmt = cls._transition_stmt(OrderModel.id.in_(order_ids), target)
+        orders = list((await session.execute(stmt)).all())
+        await SellerStatsService.record_transitions(session, orders)
+        return orders
+
+    @classmethod
+    async def _raise_invalid_transition(
+        cls,
+        session: AsyncSession,
+        order_id: UUID,
+        target: OrderStatus,
+    ) -> None:
+        current = await session.scalar(select(OrderModel.status).where(OrderModel.id == order_id))
+        if current is None:
+            raise ORDER_NOT_FOUND_EXCEPTION
+        if current == target:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Order is already {target.value}",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Order cannot move from {current.value} to {target.value}",
+        )
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from typing import Any
+
+from faststream.rabbit import RabbitBroker
+from sqlalchemy import select, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.metrics import rabbitmq_publish_duration
+from app.core.rabbit_config import rabbit_broker
+from app.models.outbox import OutboxMessageModel
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    """Broker messages are written to `outbox_messages` in the same transaction
+    as the order change and published later by `OutboxRelay`."""
+
+    @classmethod
+    async def enqueue(cls, session: AsyncSession, routing_key: str, payload: dict[str, Any]) -> None:
+        await cls.enqueue_many(session, [(routing_key, payload)])
+
+    @classmethod
+    async def enqueue_many(
+        cls,
+        session: AsyncSession,
+        messages: list[tuple[str, dict[str, Any]]],
+    ) -> None:
+        if not messages:
+            return
+        await session.execute(
+            insert(OutboxMessageModel),
+            [{"routing_key": routing_key, "payload": payload} for routing_key, payload in messages],
+        )
+
+
+class OutboxRelay:
+    """Background task that drains the outbox to RabbitMQ in batches.
+
+    Rows are locked with FOR UPDATE SKIP LOCKED, so several app instances can
+    relay at the same time, and deleted only after the broker confirmed every
+    publish of the batch (at-least-once delivery).
+    """
+
+    def __init__(
+        self,
+        broker: RabbitBroker,
+        session_factory: async_sessionmaker,
+        batch_size: int,
+        poll_interval: float,
+    ):
+        self._broker = broker
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    def notify(self) -> None:
+        """Wakes the relay up right after a commit instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                published = await self.relay_batch()
+            except Exception:
+                logger.exception("Outbox relay failed")
+                published = 0
+
+            if published >= self._batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _publish(self, message: OutboxMessageModel) -> None:
+        with rabbitmq_publish_duration.time(routing_key=message.routing_key):
+            await self._broker.publish(message.payload, routing_key=message.routing_key)
+
+    async def relay_batch(self) -> int:
+        async with self._session_factory() as session:
+            stmt = (
+                select(OutboxMessageModel)
+                .order_by(OutboxMessageModel.id)
+                .limit(self._batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            messages = (await session.scalars(stmt)).all()
+            if not messages:
+                return 0
+
+            await asyncio.gather(*(self._publish(message) for message in messages))
+            await session.execute(
+                delete(OutboxMessageModel).where(
+                    OutboxMessageModel.id.in_([message.id for message in messages])
+                )
+            )
+            await session.commit()
+            return len(messages)
+
+
+outbox_relay = OutboxRelay(
+    rabbit_broker,
+    async_session_factory,
+    batch_size=settings.rabbitmq.OUTBOX_BATCH_SIZE,
+    poll_interval=settings.rabbitmq.OUTBOX_POLL_INTERVAL_SECONDS,
+)
@@ -0,0 +1,107 @@
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orders import OrderModel, OrderItemModel
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionService:
+    """Monthly range partitions of the order tables, named `<table>_pYYYY_MM`.
+
+    Months are UTC, like the partitions created by the migration.
+    """
+
+    TABLES = (OrderModel.__tablename__, OrderItemModel.__tablename__)
+
+    @staticmethod
+    def month_start(moment: datetime) -> datetime:
+        moment = moment.astimezone(timezone.utc)
+        return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+    @staticmethod
+    def add_months(month: datetime, months: int) -> datetime:
+        index = month.year * 12 + month.month - 1 + months
+        return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+    @staticmethod
+    def partition_name(table: str, month: datetime) -> str:
+        return f"{table}_p{month:%Y_%m}"
+
+    @classmethod
+    def parse_partition_month(cls, table: str, name: str) -> datetime | None:
+        """Month of a monthly partition name; None for the default partition."""
+        try:
+            return datetime.strptime(name.removeprefix(f"{table}_p"), "%Y_%m").replace(
+                tzinfo=timezone.utc
+            )
+        except ValueError:
+            return None
+
+    @classmethod
+    async def list_partitions(cls, session: AsyncSession, table: str) -> list[str]:
+        result = await session.execute(
+            text(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = :table
+                ORDER BY child.relname
+                """
+            ),
+            {"table": table},
+        )
+        return list(result.scalars().all())
+
+    @classmethod
+    async def ensure_partitions(
+        cls,
+        session: AsyncSession,
+        months_ahead: int,
+        now: datetime | None = None,
+    ) -> list[str]:
+        """Creates the missing partitions from the current month up to
+        `months_ahead` months later; does not commit.
+
+        Fails if the default partition already holds rows of a missing month;
+        those have to be moved out of it first.
+        """
+        current = cls.month_start(now or datetime.now(timezone.utc))
+        created = []
+        for table in cls.TABLES:
+            existing = set(await cls.list_partitions(session, table))
+            for offset in range(months_ahead + 1):
+                month = cls.add_months(current, offset)
+                name = cls.partition_name(table, month)
+                if name in existing:
+                    continue
+                await session.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') "
+                        f"TO ('{cls.add_months(month, 1).isoformat()}')"
+                    )
+                )
+                created.append(name)
+        return created
+
+    @classmethod
+    async def drop_empty_partitions(cls, session: AsyncSession, before: datetime) -> list[str]:
+        """Drops monthly partitions that end before `before` and hold no rows,
+        e.g. once archival emptied them; does not commit."""
+        dropped = []
+        for table in cls.TABLES:
+            for name in await cls.list_partitions(session, table):
+                month = cls.parse_partition_month(table, name)
+                if month is None or cls.add_months(month, 1) > before:
+                    continue
+                if await session.scalar(text(f"SELECT EXISTS (SELECT 1 FROM {name})")):
+                    continue
+                await session.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+        return dropped
@@ -0,0 +1,104 @@
+from uuid import UUID
+
+from sqlalchemy import select, and_, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis_client import redis_storage
+from app.models.orders import OrderModel, OrderItemModel, PURCHASED_STATUSES
+from app.services.archive_service import OrderArchiveService
+
+
+class PurchasesService:
+    PURCHASED_KEY_PREFIX = "purchased"
+    # keeps the set alive for users without purchases, product ids are never "-"
+    EMPTY_MARKER = "-"
+    # set by a payment while the user's set is not cached; a backfill that read
+    # Postgres before the payment committed must not create the set meanwhile
+    ABSENT_MARKER_SUFFIX = "absent"
+    ABSENT_MARKER_TTL_MS = 30_000
+
+    @classmethod
+    def _build_key(cls, user_id: UUID) -> str:
+        return f"{cls.PURCHASED_KEY_PREFIX}:{user_id}"
+
+    @classmethod
+    def _build_absent_marker(cls, user_id: UUID) -> str:
+        return f"{cls.PURCHASED_KEY_PREFIX}:{user_id}:{cls.ABSENT_MARKER_SUFFIX}"
+
+    @classmethod
+    def backfill_entry(cls, user_id: UUID, product_ids) -> tuple[str, str, list]:
+        """Argument of `RedisStorage.backfill_sets` for one user."""
+        return (
+            cls._build_key(user_id),
+            cls._build_absent_marker(user_id),
+            [cls.EMPTY_MARKER, *product_ids],
+        )
+
+    @classmethod
+    async def check(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        product_ids: list[int],
+    ) -> dict[int, bool]:
+        if not product_ids:
+            return {}
+
+        key = cls._build_key(user_id)
+        flags = await redis_storage.get_set_membership(key, product_ids)
+        if flags is not None:
+            return dict(zip(product_ids, flags))
+
+        purchased = await cls.get_purchased_product_ids(session, user_id)
+        await redis_storage.backfill_sets(
+            [cls.backfill_entry(user_id, purchased)],
+            ttl_seconds=settings.redis.PURCHASED_PRODUCTS_TTL_SECONDS,
+        )
+        return {product_id: product_id in purchased for product_id in product_ids}
+
+    @classmethod
+    async def has_purchased(
+        cls,
+        session: AsyncSession,
+        user_id: UUID,
+        product_id: int,
+    ) -> bool:
+        purchased = await cls.check(session, user_id, [product_id])
+        return purchased[product_id]
+
+    @classmethod
+    async def get_purchased_product_ids(cls, session: AsyncSession, user_id: UUID) -> set[int]:
+        stmt = (
+            select(OrderItemModel.product_id)
+            .join(OrderModel, OrderModel.id == OrderItemModel.order_id)
+            .where(
+                and_(
+                    OrderModel.user_id == user_id,
+                    OrderModel.status.in_(PURCHASED_STATUSES),
+                )
+            )
+        )
+        # archived orders count as purchases too
+        stmt = union(stmt, OrderArchiveService.purchased_product_ids_stmt(user_id))
+        return set((await session.scalars(stmt)).all())
+
+    @classmethod
+    async def record_order(cls, session: AsyncSession, order_id: UUID) -> None:
+        """Adds the products of a paid order to the user's set, if the set is
+        cached; otherwise holds off backfills that may have missed the order."""
+        stmt = (
+            select(OrderModel.user_id, OrderItemModel.product_id)
+            .join(OrderItemModel, OrderItemModel.order_id == OrderModel.id)
+            .where(OrderModel.id == order_id)
+        )
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return
+
+        await redis_storage.add_to_existing_set(
+            cls._build_key(rows[0].user_id),
+            sorted({row.product_id for row in rows}),
+            absent_marker=cls._build_absent_marker(rows[0].user_id),
+            absent_marker_ttl_ms=cls.ABSENT_MARKER_TTL_MS,
+        )
@@ -0,0 +1,74 @@
+import logging
+from typing import Iterable
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import replica_enabled
+from app.core.redis_client import redis_storage
+
+logger = logging.getLogger(__name__)
+
+
+class ReadRouting:
+    """Sends reads to the replica unless the order or user was written within
+    the replication lag window.
+
+    Writers mark the touched orders and users in Redis for
+    DB_REPLICA_FRESHNESS_MS. Reads about a marked entity use the primary
+    session, and so do all reads while Redis is unavailable. Without a
+    configured replica this is a no-op.
+    """
+
+    FRESH_KEY_PREFIX = "fresh"
+
+    @classmethod
+    def _build_key(cls, kind: str, entity_id: UUID) -> str:
+        return f"{cls.FRESH_KEY_PREFIX}:{kind}:{entity_id}"
+
+    @classmethod
+    async def mark_written(
+        cls,
+        *,
+        order_ids: Iterable[UUID] = (),
+        user_ids: Iterable[UUID] = (),
+    ) -> None:
+        if not replica_enabled:
+            return
+        keys = [cls._build_key("order", order_id) for order_id in order_ids]
+        keys += [cls._build_key("user", user_id) for user_id in set(user_ids)]
+        await redis_storage.set_json_many(
+            dict.fromkeys(keys, 1), ttl_ms=settings.pg_database.DB_REPLICA_FRESHNESS_MS
+        )
+
+    @classmethod
+    async def _is_fresh(cls, kind: str, entity_id: UUID) -> bool:
+        try:
+            return await redis_storage.get_json(cls._build_key(kind, entity_id)) is not None
+        except RedisError:
+            logger.warning("Freshness check failed, reading %s %s from the primary", kind, entity_id)
+            return True
+
+    @classmethod
+    async def session_for_user(
+        cls,
+        user_id: UUID,
+        session: AsyncSession,
+        read_session: AsyncSession,
+    ) -> AsyncSession:
+        if replica_enabled and not await cls._is_fresh("user", user_id):
+            return read_session
+        return session
+
+    @classmethod
+    async def session_for_order(
+        cls,
+        order_id: UUID,
+        session: AsyncSession,
+        read_session: AsyncSession,
+    ) -> AsyncSession:
+        if replica_enabled and not await cls._is_fresh("order", order_id):
+            return read_session
+        return session
@@ -0,0 +1,257 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timezone
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Row, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.orders import OrderItemModel, OrderStatus
+from app.models.seller_stats import SellerDailyStatsModel
+
+# (seller_id, day, status) -> [orders_count, units, revenue]
+Deltas = dict[tuple[UUID, date, OrderStatus], list]
+
+
+class SellerStatsService:
+    """Maintains and reads the `seller_daily_stats` rollup.
+
+    An order is counted on the UTC day it was created, under its current
+    status, once per seller with items in it. Creating an order adds it
+    under PENDING and a transition moves it from the previous status to the
+    new one, in the writer's transaction. Rows touched by concurrent orders
+    of the same seller and day are locked until those transactions commit.
+    """
+
+    @staticmethod
+    def day_of(created_at: datetime) -> date:
+        return created_at.astimezone(timezone.utc).date()
+
+    @staticmethod
+    def day_start(day: date) -> datetime:
+        return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+    @staticmethod
+    def _add(deltas: Deltas, key: tuple, sign: int, units: int, revenue: float) -> None:
+        totals = deltas.setdefault(key, [0, 0, 0.0])
+        totals[0] += sign
+        totals[1] += sign * units
+        totals[2] += sign * revenue
+
+    @classmethod
+    async def _apply_deltas(cls, session: AsyncSession, deltas: Deltas) -> None:
+        rows = [
+            {
+                "seller_id": seller_id,
+                "day": day,
+                "status": order_status,
+                "orders_count": orders_count,
+                "units": units,
+                "revenue": revenue,
+            }
+            # a stable order keeps concurrent writers from deadlocking on the rows
+            for (seller_id, day, order_status), (orders_count, units, revenue) in sorted(
+                deltas.items(), key=lambda item: (str(item[0][0]), item[0][1], item[0][2].name)
+            )
+            if orders_count or units or revenue
+        ]
+        if not rows:
+            return
+        stmt = pg_insert(SellerDailyStatsModel)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                SellerDailyStatsModel.seller_id,
+                SellerDailyStatsModel.day,
+                SellerDailyStatsModel.status,
+            ],
+            set_={
+                "orders_count": SellerDailyStatsModel.orders_count + stmt.excluded.orders_count,
+                "units": SellerDailyStatsModel.units + stmt.excluded.units,
+                "revenue": SellerDailyStatsModel.revenue + stmt.excluded.revenue,
+            },
+        )
+        await session.execute(stmt, rows)
+
+    @classmethod
+    async def record_created(
+        cls,
+        session: AsyncSession,
+        item_rows: Iterable[dict],
+        created_at_by_order_id: dict[UUID, datetime],
+    ) -> None:
+        """Adds new PENDING orders from their item rows; does not commit."""
+        per_order_seller: dict[tuple[UUID, UUID], list] = defaultdict(lambda: [0, 0.0])
+        for item in item_rows:
+            if item.get("seller_id") is None:
+                continue
+            totals = per_order_seller[(item["order_id"], item["seller_id"])]
+            totals[0] += item["quantity"]
+            totals[1] += item["quantity"] * (item.get("price") or 0)
+
+        deltas: Deltas = {}
+        for (order_id, seller_id), (units, revenue) in per_order_seller.items():
+            key = (seller_id, cls.day_of(created_at_by_order_id[order_id]), OrderStatus.PENDING)
+            cls._add(deltas, key, 1, units, revenue)
+        await cls._apply_deltas(session, deltas)
+
+    @classmethod
+    async def record_transitions(cls, session: AsyncSession, orders: list[Row]) -> None:
+        """Moves transitioned orders between status rows; does not commit.
+
+        `orders` are rows with id, created_at, status and previous_status,
+        as returned by `OrderStateMachine`.
+        """
+        if not orders:
+            return
+        created_at = [order.created_at for order in orders]
+        items_stmt = (
+            select(
+                OrderItemModel.order_id,
+                OrderItemModel.seller_id,
+                func.sum(OrderItemModel.quantity).label("units"),
+                func.sum(
+                    OrderItemModel.quantity * func.coalesce(OrderItemModel.price, 0)
+                ).label("revenue"),
+            )
+            .where(
+                OrderItemModel.order_id.in_([order.id for order in orders]),
+                OrderItemModel.created_at.between(min(created_at), max(created_at)),
+                OrderItemModel.seller_id.is_not(None),
+            )
+            .group_by(OrderItemModel.order_id, OrderItemModel.seller_id)
+        )
+        orders_by_id = {order.id: order for order in orders}
+
+        deltas: Deltas = {}
+        for item in (await session.execute(items_stmt)).all():
+            order = orders_by_id[item.order_id]
+            day = cls.day_of(order.created_at)
+            units, revenue = int(item.units or 0), float(item.revenue or 0)
+            cls._add(deltas, (item.seller_id, day, order.previous_status), -1, units, revenue)
+            cls._add(deltas, (item.seller_id, day, order.status), 1, units, revenue)
+        await cls._apply_deltas(session, deltas)
+
+    @classmethod
+    async def get_orders_count(cls, session: AsyncSession, seller_id: UUID) -> int:
+        stmt = select(func.sum(SellerDailyStatsModel.orders_count)).where(
+            SellerDailyStatsModel.seller_id == seller_id
+        )
+        return int(await session.scalar(stmt) or 0)
+
+    @classmethod
+    async def get_stats(
+        cls,
+        session: AsyncSession,
+        seller_id: UUID,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> dict:
+        """Totals, per-status totals and per-day figures for days in
+        [`date_from`, `date_to`], both inclusive and optional."""
+        stmt = (
+            select(
+                SellerDailyStatsModel.day,
+                SellerDailyStatsModel.status,
+                SellerDailyStatsModel.orders_count,
+                SellerDailyStatsModel.units,
+                SellerDailyStatsModel.revenue,
+            )
+            .where(SellerDailyStatsModel.seller_id == seller_id)
+            .order_by(SellerDailyStatsModel.day, SellerDailyStatsModel.status)
+        )
+        if date_from:
+            stmt = stmt.where(SellerDailyStatsModel.day >= date_from)
+        if date_to:
+            stmt = stmt.where(SellerDailyStatsModel.day <= date_to)
+        rows = (await session.execute(stmt)).all()
+
+        def empty() -> dict:
+            return {"orders_count": 0, "units": 0, "revenue": 0.0}
+
+        totals = empty()
+        by_status: dict[str, dict] = {}
+        days: dict[date, dict] = {}
+        for row in rows:
+            day = days.setdefault(row.day, {"day": row.day, **empty(), "by_status": {}})
+            for bucket in (totals, by_status.setdefault(row.status.value, empty()), day):
+                bucket["orders_count"] += row.orders_count
+                bucket["units"] += row.units
+                bucket["revenue"] += row.revenue
+            day["by_status"][row.status.value] = row.orders_count
+
+        return {
+            "seller_id": seller_id,
+            "from": date_from,
+            "to": date_to,
+            **totals,
+            "by_status": by_status,
+            "days": list(days.values()),
+        }
+
+    # live and archived orders alike; archive items are
+    # [product_id, quantity, price, seller_id] rows
+    _REBUILD_SQL = text(
+        """
+        INSERT INTO seller_daily_stats (seller_id, day, status, orders_count, units, revenue)
+        SELECT seller_id, day, status, count(DISTINCT order_id), sum(quantity), sum(revenue)
+        FROM (
+            SELECT
+                i.seller_id,
+                (o.created_at AT TIME ZONE 'UTC')::date AS day,
+                o.status,
+                o.id AS order_id,
+                i.quantity,
+                i.quantity * coalesce(i.price, 0) AS revenue
+            FROM orders AS o
+            JOIN order_items AS i ON i.order_id = o.id AND i.created_at = o.created_at
+            WHERE i.seller_id IS NOT NULL
+              AND o.created_at >= :start AND o.created_at < :end
+            UNION ALL
+            SELECT
+                (item ->> 3)::uuid,
+                (a.created_at AT TIME ZONE 'UTC')::date,
+                a.status,
+                a.id,
+                (item ->> 1)::integer,
+                (item ->> 1)::integer * coalesce((item ->> 2)::double precision, 0)
+            FROM orders_archive AS a
+            CROSS JOIN LATERAL jsonb_array_elements(a.items) AS item
+            WHERE item ->> 3 IS NOT NULL
+              AND a.created_at >= :start AND a.created_at < :end
+        ) AS history
+        GROUP BY seller_id, day, status
+        """
+    )
+
+    @classmethod
+    async def get_history_start(cls, session: AsyncSession) -> date | None:
+        """Creation day of the oldest live or archived order."""
+        oldest = await session.scalar(
+            text(
+                "SELECT least((SELECT min(created_at) FROM orders), "
+                "(SELECT min(created_at) FROM orders_archive))"
+            )
+        )
+        return cls.day_of(oldest) if oldest else None
+
+    @classmethod
+    async def rebuild(cls, session: AsyncSession, start: date, end: date) -> int:
+        """Recomputes the rollup rows of days in [`start`, `end`) from history;
+        does not commit.
+
+        The table is locked against writers until the caller commits, so
+        orders created or transitioned meanwhile wait and then apply their
+        own deltas on top of the rebuilt rows.
+        """
+        await session.execute(text("LOCK TABLE seller_daily_stats IN SHARE ROW EXCLUSIVE MODE"))
+        await session.execute(
+            SellerDailyStatsModel.__table__.delete().where(
+                SellerDailyStatsModel.day >= start,
+                SellerDailyStatsModel.day < end,
+            )
+        )
+        result = await session.execute(
+            cls._REBUILD_SQL, {"start": cls.day_start(start), "end": cls.day_start(end)}
+        )
+        return result.rowcount
@@ -0,0 +1,130 @@
+import asyncio
+import copy
+import time
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Iterable
+
+from app.core.config import settings
+from app.core.metrics import service_cache_stats
+from app.core.redis_client import redis_storage
+from app.interfaces import RedisStorage
+from app.schemas import OrderBaseSchema
+
+StockKey = tuple[tuple[int, int], ...]
+StockFetcher = Callable[[list[dict]], Awaitable[dict]]
+
+
+@dataclass
+class StockCheckStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class StockCheckCoalescer:
+    """Single-flight wrapper around product-service stock checks.
+
+    Concurrent checks for the same normalized set of (product_id, quantity)
+    pairs share one in-flight request, and successful results can be kept
+    in a very short TTL cache (in process or in Redis).
+    """
+
+    CACHE_KEY_PREFIX = "stock_check"
+
+    def __init__(
+        self,
+        *,
+        enabled: bool,
+        cache_backend: str,
+        cache_ttl_ms: int,
+        storage: RedisStorage,
+    ):
+        self.enabled = enabled
+        self.cache_backend = cache_backend if cache_ttl_ms > 0 else "none"
+        self.cache_ttl_ms = cache_ttl_ms
+        self.stats = StockCheckStats()
+        self._storage = storage
+        self._in_flight: dict[StockKey, asyncio.Task] = {}
+        self._memory_cache: dict[StockKey, tuple[float, dict]] = {}
+
+    @staticmethod
+    def normalize(items: Iterable[OrderBaseSchema]) -> StockKey:
+        quantities: dict[int, int] = {}
+        for item in items:
+            quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+        return tuple(sorted(quantities.items()))
+
+    @staticmethod
+    def to_payload(key: StockKey) -> list[dict]:
+        return [{"product_id": product_id, "quantity": quantity} for product_id, quantity in key]
+
+    def _cache_key(self, key: StockKey) -> str:
+        return f"{self.CACHE_KEY_PREFIX}:" + ",".join(f"{p}x{q}" for p, q in key)
+
+    async def _cache_get(self, key: StockKey) -> dict | None:
+        if self.cache_backend == "memory":
+            entry = self._memory_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                self._memory_cache.pop(key, None)
+                return None
+            return result
+        if self.cache_backend == "redis":
+            return await self._storage.get_json(self._cache_key(key))
+        return None
+
+    async def _cache_set(self, key: StockKey, result: dict) -> None:
+        if self.cache_backend == "memory":
+            now = time.monotonic()
+            if len(self._memory_cache) > 10_000:
+                self._memory_cache = {
+                    k: v for k, v in self._memory_cache.items() if v[0] >= now
+                }
+            self._memory_cache[key] = (now + self.cache_ttl_ms / 1000, result)
+        elif self.cache_backend == "redis":
+            await self._storage.set_json(self._cache_key(key), result, ttl_ms=self.cache_ttl_ms)
+
+    async def _fetch_and_store(self, key: StockKey, fetch: StockFetcher) -> dict:
+        result = await fetch(self.to_payload(key))
+        await self._cache_set(key, result)
+        return result
+
+    async def check(self, items: Iterable[OrderBaseSchema], fetch: StockFetcher) -> dict:
+        key = self.normalize(items)
+        if not self.enabled:
+            self.stats.misses += 1
+            return await fetch(self.to_payload(key))
+
+        cached = await self._cache_get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return copy.deepcopy(cached)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.stats.misses += 1
+            task = asyncio.create_task(self._fetch_and_store(key, fetch))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.stats.coalesced += 1
+
+        # callers mutate the response (e.g. seller_id parsing), so each gets its own copy
+        return copy.deepcopy(await asyncio.shield(task))
+
+
+stock_check_coalescer = StockCheckCoalescer(
+    enabled=settings.stock_check.STOCK_CHECK_COALESCE,
+    cache_backend=settings.stock_check.STOCK_CHECK_CACHE_BACKEND,
+    cache_ttl_ms=settings.stock_check.STOCK_CHECK_CACHE_TTL_MS,
+    storage=redis_storage,
+)
+
+service_cache_stats.add_collector(
+    lambda: {("stock_check", stat): value for stat, value in stock_check_coalescer.stats.as_dict().items()}
+)
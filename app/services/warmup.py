@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.database import async_session_factory, read_session_factory, replica_enabled
+from app.models.orders import OrderStatus
+from app.services.order_service import OrderService
+from app.services.order_state_machine import OrderStateMachine
+from app.services.purchases_service import PurchasesService
+from app.services.seller_stats_service import SellerStatsService
+
+logger = logging.getLogger(__name__)
+
+# matches no order, so the warm-up statements touch no rows
+NIL_ID = UUID(int=0)
+
+
+async def _run_read_statements(session) -> None:
+    """The statements the read routes run."""
+    await OrderService.load_order(session, NIL_ID)
+    await OrderService.get_orders_by_user_id(session, NIL_ID)
+    await OrderService.get_orders_by_seller_id(session, NIL_ID)
+    await OrderService.get_orders_by_seller_id_json(session, NIL_ID)
+    await OrderService.get_orders_count_by_seller_id(session, NIL_ID)
+    await SellerStatsService.get_stats(session, NIL_ID)
+    await PurchasesService.get_purchased_product_ids(session, NIL_ID)
+    await PurchasesService.record_order(session, NIL_ID)
+
+
+async def _run_transition_statements(session) -> None:
+    await OrderStateMachine.transition_many(session, [NIL_ID], OrderStatus.RESERVED)
+    await OrderStateMachine.transition_many(session, [NIL_ID], OrderStatus.RESERVATION_FAILED)
+
+
+async def _warm_connection(session_factory, with_transitions: bool) -> None:
+    async with session_factory() as session:
+        await _run_read_statements(session)
+        if with_transitions:
+            await _run_transition_statements(session)
+        await session.rollback()
+
+
+async def warm_up_database(*, with_transitions: bool = False, with_replica: bool = False) -> None:
+    """Opens `DB_POOL_SIZE` connections at once and runs the statements of the
+    order routes on each of them.
+
+    This fills SQLAlchemy's compiled cache and asyncpg's per-connection
+    prepared statements before the first real request. INSERTs are skipped,
+    because they cannot run without writing. `with_transitions` adds the
+    consumer's UPDATEs. `with_replica` warms the replica pool with the reads
+    too. A failure is logged and does not block startup.
+    """
+    if not settings.pg_database.DB_WARMUP:
+        return
+    started = time.perf_counter()
+    connections = settings.pg_database.DB_POOL_SIZE
+    try:
+        warmups = [
+            _warm_connection(async_session_factory, with_transitions) for _ in range(connections)
+        ]
+        if with_replica and replica_enabled:
+            warmups += [_warm_connection(read_session_factory, False) for _ in range(connections)]
+        await asyncio.gather(*warmups)
+    except Exception:
+        logger.exception("Database warm-up failed")
+        return
+    logger.info(
+        "Database warm-up: %s connections in %.0f ms",
+        connections,
+        (time.perf_counter() - started) * 1000,
+    )
@@ -0,0 +1,82 @@
+"""Per-request vs pooled httpx client for product-service stock checks.
+
+Usage:
+    python -m benchmarks.bench_http_client [--rounds 5] [--latency 0.005]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from benchmarks.stubs import StubServer, build_product_service_stub
+
+CONCURRENCY_LEVELS = (1, 50, 500)
+PAYLOAD = {"items": [{"product_id": 1, "quantity": 2}, {"product_id": 7, "quantity": 1}]}
+
+
+async def per_request_check(url: str) -> None:
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{url}/products/stock", json=PAYLOAD)
+        response.raise_for_status()
+
+
+def pooled_check_factory(client: httpx.AsyncClient):
+    async def pooled_check(url: str) -> None:
+        response = await client.post("/products/stock", json=PAYLOAD)
+        response.raise_for_status()
+
+    return pooled_check
+
+
+async def run_level(check, url: str, concurrency: int) -> list[float]:
+    async def one() -> float:
+        started = time.perf_counter()
+        await check(url)
+        return time.perf_counter() - started
+
+    return list(await asyncio.gather(*(one() for _ in range(concurrency))))
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, concurrency: int, latencies: list[float], wall: float) -> None:
+    print(
+        f"{name:<12} c={concurrency:<4} "
+        f"p50={percentile(latencies, 50) * 1000:8.2f}ms "
+        f"p99={percentile(latencies, 99) * 1000:8.2f}ms "
+        f"mean={statistics.mean(latencies) * 1000:8.2f}ms "
+        f"rps={len(latencies) / wall:9.1f}"
+    )
+
+
+async def main(rounds: int, latency: float) -> None:
+    async with StubServer(build_product_service_stub(latency=latency)) as server:
+        pooled_client = httpx.AsyncClient(
+            base_url=server.url,
+            limits=httpx.Limits(max_connections=500, max_keepalive_connections=500),
+        )
+        pooled_check = pooled_check_factory(pooled_client)
+        try:
+            for concurrency in CONCURRENCY_LEVELS:
+                for name, check in (("per-request", per_request_check), ("pooled", pooled_check)):
+                    latencies: list[float] = []
+                    started = time.perf_counter()
+                    for _ in range(rounds):
+                        latencies.extend(await run_level(check, server.url, concurrency))
+                    report(name, concurrency, latencies, time.perf_counter() - started)
+        finally:
+            await pooled_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.latency))
@@ -0,0 +1,88 @@
+"""ORM per-row adds vs the bulk insert path used by `create_order`.
+
+Runs against the Postgres configured in the environment (alembic upgrade
+head must have been applied). Every iteration is rolled back.
+
+Usage:
+    python -m benchmarks.bench_order_insert [--iterations 50]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import insert
+
+from app.core.database import async_session_factory, engine
+from app.models.orders import OrderModel, OrderItemModel, OrderStatus
+from app.services.order_service import OrderService
+
+CART_SIZES = (1, 20, 200)
+
+
+def make_products(lines: int) -> list[dict]:
+    return [
+        {"product_id": i, "quantity": 1, "price": 10.0, "seller_id": str(uuid4())}
+        for i in range(lines)
+    ]
+
+
+async def orm_per_row(session, products: list[dict]) -> None:
+    order = OrderModel(user_id=uuid4(), status=OrderStatus.PENDING, total_amount=0)
+    session.add(order)
+    await session.flush()
+    for item in products:
+        session.add(
+            OrderItemModel(
+                product_id=item["product_id"],
+                quantity=item["quantity"],
+                price=item["price"],
+                order_id=order.id,
+            )
+        )
+    await session.flush()
+
+
+async def bulk(session, products: list[dict]) -> None:
+    order_id = await session.scalar(
+        insert(OrderModel)
+        .values(id=uuid4(), user_id=uuid4(), status=OrderStatus.PENDING, total_amount=0)
+        .returning(OrderModel.id)
+    )
+    await session.execute(
+        insert(OrderItemModel), OrderService._build_order_item_rows(order_id, products)
+    )
+
+
+async def measure(write, lines: int, iterations: int) -> list[float]:
+    products = make_products(lines)
+    timings = []
+    for _ in range(iterations):
+        async with async_session_factory() as session:
+            started = time.perf_counter()
+            await write(session, [dict(p) for p in products])
+            timings.append(time.perf_counter() - started)
+            await session.rollback()
+    return timings
+
+
+async def main(iterations: int) -> None:
+    try:
+        for lines in CART_SIZES:
+            for name, write in (("orm-per-row", orm_per_row), ("bulk", bulk)):
+                timings = await measure(write, lines, iterations)
+                print(
+                    f"{name:<12} lines={lines:<4} "
+                    f"median={statistics.median(timings) * 1000:8.2f}ms "
+                    f"max={max(timings) * 1000:8.2f}ms"
+                )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,162 @@
+"""Checkout write-path latency: publish in the request vs transactional outbox.
+
+A slow broker stand-in (`SlowBroker`) adds a fixed delay to every
+publish. The direct mode publishes inside the request, as create_order
+used to do. The outbox mode only inserts the message, and an
+`OutboxRelay` publishes it in the background; the run ends once the
+relay has drained the outbox, and the time until then is reported too.
+Runs against the Postgres configured in the environment (alembic
+upgrade head must have been applied), whose outbox must be empty. The
+orders written are deleted afterwards.
+
+Usage:
+    python -m benchmarks.bench_outbox_checkout [--delay 0.05] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete, func, insert, select
+
+from app.core.config import settings
+from app.core.database import async_session_factory, engine
+from app.models.orders import OrderModel, OrderItemModel, OrderStatus
+from app.models.outbox import OutboxMessageModel
+from app.schemas import OrderBaseSchema
+from app.services.order_service import OrderService
+from app.services.outbox_service import OutboxRelay, OutboxService
+
+ITEMS = [OrderBaseSchema(product_id=i, quantity=1) for i in range(5)]
+PRODUCTS = [{"product_id": i, "quantity": 1, "price": 10.0, "seller_id": None} for i in range(5)]
+
+
+class SlowBroker:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def publish(self, message, routing_key: str) -> None:
+        await asyncio.sleep(self.delay)
+
+
+async def write_order(session) -> tuple:
+    order_id = await session.scalar(
+        insert(OrderModel)
+        .values(id=uuid4(), user_id=uuid4(), status=OrderStatus.PENDING, total_amount=50)
+        .returning(OrderModel.id)
+    )
+    await session.execute(
+        insert(OrderItemModel), OrderService._build_order_item_rows(order_id, PRODUCTS)
+    )
+    return order_id
+
+
+async def direct_checkout(broker: SlowBroker, order_ids: list) -> float:
+    async with async_session_factory() as session:
+        started = time.perf_counter()
+        order_id = await write_order(session)
+        await broker.publish(
+            OrderService._build_reservation_payload(order_id, ITEMS),
+            routing_key=settings.rabbitmq.PRODUCTS_RESERVE_ROUTING_KEY,
+        )
+        await session.commit()
+        order_ids.append(order_id)
+        return time.perf_counter() - started
+
+
+async def outbox_checkout(relay: OutboxRelay, order_ids: list) -> float:
+    async with async_session_factory() as session:
+        started = time.perf_counter()
+        order_id = await write_order(session)
+        await OutboxService.enqueue(
+            session,
+            settings.rabbitmq.PRODUCTS_RESERVE_ROUTING_KEY,
+            OrderService._build_reservation_payload(order_id, ITEMS),
+        )
+        await session.commit()
+        relay.notify()
+        order_ids.append(order_id)
+        return time.perf_counter() - started
+
+
+async def outbox_size() -> int:
+    async with async_session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(OutboxMessageModel))
+
+
+async def wait_for_empty_outbox() -> None:
+    while await outbox_size():
+        await asyncio.sleep(0.01)
+
+
+async def delete_orders(order_ids: list) -> None:
+    async with async_session_factory() as session:
+        await session.execute(delete(OrderItemModel).where(OrderItemModel.order_id.in_(order_ids)))
+        await session.execute(delete(OrderModel).where(OrderModel.id.in_(order_ids)))
+        await session.commit()
+
+
+def print_timings(
+    name: str, delay: float, concurrency: int, timings: list[float], extra: str = ""
+) -> None:
+    timings.sort()
+    print(
+        f"{name:<7} broker_delay={delay * 1000:.0f}ms c={concurrency} "
+        f"p50={statistics.median(timings) * 1000:8.2f}ms "
+        f"p99={timings[int(len(timings) * 0.99) - 1] * 1000:8.2f}ms{extra}"
+    )
+
+
+async def main(delay: float, concurrency: int, rounds: int) -> None:
+    broker = SlowBroker(delay)
+    relay = OutboxRelay(
+        broker,
+        async_session_factory,
+        batch_size=settings.rabbitmq.OUTBOX_BATCH_SIZE,
+        poll_interval=settings.rabbitmq.OUTBOX_POLL_INTERVAL_SECONDS,
+    )
+    order_ids: list = []
+    try:
+        if await outbox_size():
+            # the relay below would hand those messages to the stand-in broker
+            raise SystemExit("outbox_messages is not empty; drain it (or stop the app) first")
+
+        timings: list[float] = []
+        for _ in range(rounds):
+            timings.extend(
+                await asyncio.gather(
+                    *(direct_checkout(broker, order_ids) for _ in range(concurrency))
+                )
+            )
+        print_timings("direct", delay, concurrency, timings)
+
+        timings = []
+        await relay.start()
+        started = time.perf_counter()
+        try:
+            for _ in range(rounds):
+                timings.extend(
+                    await asyncio.gather(
+                        *(outbox_checkout(relay, order_ids) for _ in range(concurrency))
+                    )
+                )
+            await wait_for_empty_outbox()
+        finally:
+            await relay.stop()
+        drained = time.perf_counter() - started
+        relayed = f" relayed {len(timings)} messages in {drained * 1000:.0f}ms"
+        print_timings("outbox", delay, concurrency, timings, relayed)
+    finally:
+        if order_ids:
+            await delete_orders(order_ids)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.delay, args.concurrency, args.rounds))
@@ -0,0 +1,103 @@
+"""Old in-Python purchase check vs the indexed query behind the purchased-products set.
+
+The second is `PurchasesService.get_purchased_product_ids`, which fills a
+user's Redis set when it is not cached.
+
+Seeds one user with 10, 1,000 and 50,000 historical order lines inside a
+transaction that is rolled back afterwards. Runs against the Postgres
+configured in the environment (alembic upgrade head must have been applied).
+
+Usage:
+    python -m benchmarks.bench_purchased_check [--iterations 50]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import select, text
+
+from app.core.database import async_session_factory, engine
+from app.models.orders import OrderModel, OrderItemModel
+from app.services.purchases_service import PurchasesService
+
+HISTORY_SIZES = (10, 1_000, 50_000)
+LINES_PER_ORDER = 5
+
+SEED_SQL = text(
+    """
+    WITH new_orders AS (
+        INSERT INTO orders (id, user_id, status, total_amount, created_at)
+        SELECT gen_random_uuid(), :user_id, 'COMPLETED', 100, now()
+        FROM generate_series(1, :orders)
+        RETURNING id
+    )
+    INSERT INTO order_items (id, order_id, product_id, quantity, price, created_at)
+    SELECT gen_random_uuid(), o.id, (random() * 1000000)::int, 1, 10, now()
+    FROM new_orders AS o, generate_series(1, :lines_per_order)
+    """
+)
+
+
+async def legacy_check(session, user_id, product_id) -> bool:
+    order_ids = list(
+        (await session.scalars(select(OrderModel.id).where(OrderModel.user_id == user_id))).all()
+    )
+    product_ids = list(
+        (
+            await session.scalars(
+                select(OrderItemModel.product_id).where(OrderItemModel.order_id.in_(order_ids))
+            )
+        ).all()
+    )
+    return product_id in product_ids
+
+
+async def purchases_check(session, user_id, product_id) -> bool:
+    return product_id in await PurchasesService.get_purchased_product_ids(session, user_id)
+
+
+async def measure(check, session, user_id, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        # a product id that is never seeded forces the worst case
+        await check(session, user_id, -1)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def main(iterations: int) -> None:
+    try:
+        for lines in HISTORY_SIZES:
+            async with async_session_factory() as session:
+                user_id = uuid4()
+                await session.execute(
+                    SEED_SQL,
+                    {
+                        "user_id": user_id,
+                        "orders": max(lines // LINES_PER_ORDER, 1),
+                        "lines_per_order": min(lines, LINES_PER_ORDER),
+                    },
+                )
+                for name, check in (
+                    ("legacy", legacy_check),
+                    ("indexed", purchases_check),
+                ):
+                    timings = await measure(check, session, user_id, iterations)
+                    print(
+                        f"{name:<8} lines={lines:<6} "
+                        f"median={statistics.median(timings) * 1000:8.2f}ms "
+                        f"max={max(timings) * 1000:8.2f}ms"
+                    )
+                await session.rollback()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
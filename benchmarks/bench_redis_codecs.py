@@ -0,0 +1,62 @@
+"""Codec and validation cost of RedisStorage model lists (no Redis needed).
+
+Compares the legacy json + per-item model_validate loop with each codec
+plus one-pass TypeAdapter validation. Codecs whose package is not
+installed are skipped.
+
+Usage:
+    python -m benchmarks.bench_redis_codecs [--iterations 2000]
+"""
+import argparse
+import json
+import timeit
+
+from app.interfaces.codecs import CODECS
+from app.interfaces.redis_interface import RedisStorage
+from app.schemas import CartSchema
+
+LIST_SIZES = (10, 100, 1_000)
+
+
+def legacy_roundtrip(items: list[CartSchema]) -> list[CartSchema]:
+    payload = json.dumps([item.model_dump() for item in items], ensure_ascii=False)
+    decoded = []
+    for raw_item in json.loads(payload):
+        try:
+            decoded.append(CartSchema.model_validate(raw_item))
+        except Exception:
+            continue
+    return decoded
+
+
+def codec_roundtrip_factory(codec):
+    storage = RedisStorage(client=None, codec=codec)
+
+    def roundtrip(items: list[CartSchema]) -> list[CartSchema]:
+        payload = codec.dumps(storage._dump_list(items))
+        return storage._validate_list(codec.loads(payload), CartSchema)
+
+    return roundtrip
+
+
+def main(iterations: int) -> None:
+    roundtrips = {"legacy-json": legacy_roundtrip}
+    for name, codec_cls in CODECS.items():
+        try:
+            roundtrips[name] = codec_roundtrip_factory(codec_cls())
+        except ImportError:
+            print(f"skipping {name}: package not installed")
+
+    for size in LIST_SIZES:
+        items = [CartSchema(product_id=i, quantity=i % 5 + 1) for i in range(size)]
+        runs = max(iterations // size, 10)
+        for name, roundtrip in roundtrips.items():
+            seconds = timeit.timeit(lambda: roundtrip(items), number=runs)
+            print(f"{name:<12} items={size:<5} {seconds / runs * 1e6:10.1f}us per roundtrip")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,80 @@
+"""Throughput of the orders.reserved consumer, per-message vs micro-batched.
+
+Uses FastStream's in-memory TestRabbitBroker, so no RabbitMQ is needed,
+but the orders are real rows in the Postgres configured in the environment
+(alembic upgrade head must have been applied). Seeded orders are deleted
+at the end.
+
+Usage:
+    python -m benchmarks.bench_reserved_consumer [--messages 5000] [--concurrency 200]
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from faststream.rabbit import TestRabbitBroker
+from sqlalchemy import delete, insert
+
+from app.core.config import settings
+from app.core.database import async_session_factory, engine
+from app.core.rabbit_config import orders_reserved_queue, rabbit_broker
+from app.fs.app import app  # noqa: F401  registers the subscribers on the broker
+from app.models.orders import OrderModel, OrderStatus
+
+
+async def seed_orders(count: int) -> list:
+    order_ids = [uuid4() for _ in range(count)]
+    async with async_session_factory() as session:
+        await session.execute(
+            insert(OrderModel),
+            [
+                {"id": order_id, "user_id": uuid4(), "status": OrderStatus.PENDING, "total_amount": 1}
+                for order_id in order_ids
+            ],
+        )
+        await session.commit()
+    return order_ids
+
+
+async def drop_orders(order_ids: list) -> None:
+    async with async_session_factory() as session:
+        await session.execute(delete(OrderModel).where(OrderModel.id.in_(order_ids)))
+        await session.commit()
+
+
+async def run(broker, order_ids: list, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def deliver(order_id) -> None:
+        # the semaphore plays the role of the channel prefetch window
+        async with semaphore:
+            await broker.publish({"order_id": str(order_id)}, queue=orders_reserved_queue)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(deliver(order_id) for order_id in order_ids))
+    return time.perf_counter() - started
+
+
+async def main(messages: int, concurrency: int) -> None:
+    try:
+        async with TestRabbitBroker(rabbit_broker) as broker:
+            for batching in (False, True):
+                settings.rabbitmq.ORDERS_RESERVED_BATCHING = batching
+                order_ids = await seed_orders(messages)
+                try:
+                    seconds = await run(broker, order_ids, concurrency)
+                finally:
+                    await drop_orders(order_ids)
+                mode = "batched" if batching else "per-message"
+                print(f"{mode:<12} {messages} msgs in {seconds:6.2f}s -> {messages / seconds:9.1f} msg/s")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency))
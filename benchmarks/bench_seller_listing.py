@@ -0,0 +1,81 @@
+"""Seller listing: ORM rows + Python payload vs Postgres-side json_agg.
+
+Seeds one seller with the given number of orders inside a transaction that
+is rolled back afterwards, then times both paths including serialization
+to the response body. Runs against the Postgres configured in the
+environment (alembic upgrade head must have been applied).
+
+Usage:
+    python -m benchmarks.bench_seller_listing [--orders 20000] [--iterations 30]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+
+from app.core.database import async_session_factory, engine
+from app.schemas import OrdersPageSchema
+from app.services.order_service import OrderService
+
+PAGE_SIZES = (50, 200)
+
+SEED_SQL = text(
+    """
+    WITH new_orders AS (
+        INSERT INTO orders (id, user_id, status, total_amount, created_at)
+        SELECT gen_random_uuid(), gen_random_uuid(), 'PAID', 100,
+               now() - make_interval(mins => i)
+        FROM generate_series(1, :orders) AS i
+        RETURNING id, created_at
+    )
+    INSERT INTO order_items (id, order_id, product_id, quantity, price, seller_id, created_at)
+    SELECT gen_random_uuid(), o.id, n, 1, 10, :seller_id, o.created_at
+    FROM new_orders AS o, generate_series(1, 3) AS n
+    """
+)
+
+
+async def python_path(session, seller_id, page) -> bytes:
+    orders_page = await OrderService.get_orders_by_seller_id(session, seller_id, page)
+    orders_count = await OrderService.get_orders_count_by_seller_id(session, seller_id)
+    return json.dumps(jsonable_encoder({"orders_count": orders_count, **orders_page})).encode()
+
+
+async def json_path(session, seller_id, page) -> bytes:
+    return await OrderService.get_orders_by_seller_id_json(session, seller_id, page)
+
+
+async def main(orders: int, iterations: int) -> None:
+    try:
+        async with async_session_factory() as session:
+            seller_id = uuid4()
+            await session.execute(SEED_SQL, {"orders": orders, "seller_id": seller_id})
+            for limit in PAGE_SIZES:
+                page = OrdersPageSchema(limit=limit)
+                for name, path in (("python", python_path), ("db-json", json_path)):
+                    timings = []
+                    for _ in range(iterations):
+                        started = time.perf_counter()
+                        await path(session, seller_id, page)
+                        timings.append(time.perf_counter() - started)
+                    print(
+                        f"{name:<8} page={limit:<4} "
+                        f"median={statistics.median(timings) * 1000:8.2f}ms "
+                        f"max={max(timings) * 1000:8.2f}ms"
+                    )
+            await session.rollback()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.iterations))
@@ -0,0 +1,113 @@
+"""End-to-end load test of the API against local stand-ins.
+
+The app runs in-process (httpx.ASGITransport with the real lifespan). The
+product service is the uvicorn stub from benchmarks.stubs, RabbitMQ is
+FastStream's TestRabbitBroker, and a stub consumer answers every
+products.reserve message with orders.reserved, so orders can be
+confirmed. Postgres and Redis are the ones configured in the environment
+(alembic upgrade head must have been applied); pass --fake-redis to use
+fakeredis instead. Everything created for the load-test users is deleted
+at the end.
+
+Usage:
+    python -m benchmarks.loadtest [--mix default|checkout|browse] [--duration 30]
+        [--concurrency 50] [--output benchmarks/results/run.json] [--compare old.json]
+"""
+import argparse
+import asyncio
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.database import engine
+from benchmarks.loadtest.environment import cleanup, local_environment
+from benchmarks.loadtest.report import (
+    Sample,
+    print_comparison,
+    print_summary,
+    summarize,
+    write_result,
+)
+from benchmarks.loadtest.scenarios import MIXES, TrafficMix
+
+
+async def virtual_user(mix: TrafficMix, measure_from: float, deadline: float, samples: list) -> None:
+    while (now := time.perf_counter()) < deadline:
+        operation = mix.pick()
+        try:
+            endpoint, response = await operation()
+            status = response.status_code
+        except Exception:
+            endpoint, status = operation.__name__, 0
+        if now >= measure_from:
+            samples.append(Sample(endpoint, status, time.perf_counter() - now))
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> None:
+    samples: list[Sample] = []
+    async with local_environment(
+        real_broker=args.real_broker,
+        fake_redis=args.fake_redis,
+        stub_latency=args.stub_latency,
+    ) as client:
+        mix = TrafficMix(
+            client, MIXES[args.mix], users=args.users, products=args.products, seed=args.seed
+        )
+        started = time.perf_counter()
+        measure_from = started + args.warmup
+        deadline = measure_from + args.duration
+        try:
+            await asyncio.gather(
+                *(
+                    virtual_user(mix, measure_from, deadline, samples)
+                    for _ in range(args.concurrency)
+                )
+            )
+        finally:
+            await cleanup(mix.user_ids)
+
+    summary = summarize(samples, args.duration)
+    print_summary(summary)
+    if args.compare:
+        print_comparison(summary, args.compare)
+
+    metadata = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        **{key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+    }
+    write_result(args.output, metadata, summary)
+    print(f"\nwritten to {args.output}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--stub-latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--real-broker", action="store_true", help="use the configured RabbitMQ")
+    parser.add_argument("--fake-redis", action="store_true", help="needs the loadtest extra")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results")
+        / f"loadtest-{datetime.now():%Y%m%d-%H%M%S}.json",
+    )
+    parser.add_argument("--compare", type=Path, default=None, help="earlier result file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from uuid import UUID
+
+import httpx
+from faststream.rabbit import TestRabbitBroker
+from sqlalchemy import Text, cast, delete, select
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.rabbit_config import rabbit_broker
+from app.core.redis_client import redis_codec, redis_storage
+from app.fs.app import app as worker_app  # noqa: F401  registers the order consumers
+from app.main import app
+from app.models.orders import OrderModel, OrderItemModel
+from app.models.outbox import OutboxMessageModel
+from app.models.seller_stats import SellerDailyStatsModel
+from app.services import CartService, FavoritesService, PurchasesService
+from app.services.order_cache import order_cache
+from app.services.read_routing import ReadRouting
+from benchmarks.stubs import StubServer, build_product_service_stub, stub_seller_ids
+
+
+@rabbit_broker.subscriber(settings.rabbitmq.PRODUCTS_RESERVE_ROUTING_KEY)
+async def reserve_products_stub(payload: dict):
+    """Stand-in for the product service consumer: every reservation succeeds."""
+    await rabbit_broker.publish(
+        {"order_id": payload["order_id"]},
+        routing_key=settings.rabbitmq.ORDERS_RESERVED_ROUTING_KEY,
+    )
+
+
+def use_fake_redis() -> None:
+    # the Lua scripts of RedisStorage need the `loadtest` extra (fakeredis[lua])
+    from fakeredis.aioredis import FakeRedis
+
+    redis_storage._client = FakeRedis(decode_responses=not redis_codec.binary)
+
+
+@asynccontextmanager
+async def local_environment(
+    *,
+    real_broker: bool = False,
+    fake_redis: bool = False,
+    stub_latency: float = 0.0,
+    stub_port: int = 18080,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Runs the API in-process against local stand-ins and yields a client for it.
+
+    The product service is the uvicorn stub, RabbitMQ is FastStream's
+    in-memory test broker (or the configured one with `real_broker`), Redis
+    is the configured one or fakeredis, and Postgres is always the configured
+    database, migrated to head.
+    """
+    async with StubServer(build_product_service_stub(latency=stub_latency), port=stub_port) as stub:
+        # read by build_http_client when the lifespan starts
+        settings.urls.NGINX_URL = stub.url
+        if fake_redis:
+            use_fake_redis()
+
+        async with TestRabbitBroker(rabbit_broker, with_real=real_broker):
+            async with app.router.lifespan_context(app):
+                async with httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=app),
+                    base_url="http://loadtest",
+                    timeout=30,
+                ) as client:
+                    yield client
+
+
+async def cleanup(user_ids: list[UUID]) -> None:
+    """Removes everything created for the load-test users: their orders with
+    the pending outbox messages and the stub sellers' rollup rows, and their
+    carts, favorites, purchases and cached orders in Redis."""
+    async with async_session_factory() as session:
+        user_orders = select(OrderModel.id).where(OrderModel.user_id.in_(user_ids))
+        order_ids = list((await session.scalars(user_orders)).all())
+        # a later app start would otherwise relay messages for deleted orders
+        await session.execute(
+            delete(OutboxMessageModel).where(
+                OutboxMessageModel.payload["order_id"].astext.in_(
+                    select(cast(OrderModel.id, Text)).where(OrderModel.user_id.in_(user_ids))
+                )
+            )
+        )
+        await session.execute(delete(OrderItemModel).where(OrderItemModel.order_id.in_(user_orders)))
+        await session.execute(delete(OrderModel).where(OrderModel.user_id.in_(user_ids)))
+        await session.execute(
+            delete(SellerDailyStatsModel).where(
+                SellerDailyStatsModel.seller_id.in_(stub_seller_ids())
+            )
+        )
+        await session.commit()
+
+    keys = [
+        service._build_key(user_id)
+        for user_id in user_ids
+        for service in (CartService, FavoritesService, PurchasesService)
+    ]
+    keys += [PurchasesService._build_absent_marker(user_id) for user_id in user_ids]
+    keys += [ReadRouting._build_key("user", user_id) for user_id in user_ids]
+    keys += [order_cache._build_key(order_id) for order_id in order_ids]
+    keys += [ReadRouting._build_key("order", order_id) for order_id in order_ids]
+    for start in range(0, len(keys), redis_storage.BULK_CHUNK_SIZE):
+        await redis_storage._client.delete(*keys[start:start + redis_storage.BULK_CHUNK_SIZE])
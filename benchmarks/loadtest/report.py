@@ -0,0 +1,86 @@
+import json
+import math
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int
+    latency: float
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: list[Sample], duration: float) -> dict[str, dict]:
+    by_endpoint: dict[str, list[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+    by_endpoint["total"] = samples
+
+    summary = {}
+    for endpoint, endpoint_samples in sorted(by_endpoint.items()):
+        latencies = sorted(sample.latency * 1000 for sample in endpoint_samples)
+        statuses: dict[str, int] = defaultdict(int)
+        for sample in endpoint_samples:
+            statuses[str(sample.status)] += 1
+        summary[endpoint] = {
+            "requests": len(endpoint_samples),
+            # status 0 means the call raised before a response
+            "errors": sum(1 for s in endpoint_samples if s.status == 0 or s.status >= 500),
+            "statuses": dict(statuses),
+            "throughput_rps": round(len(endpoint_samples) / duration, 2) if duration else 0.0,
+            "latency_ms": {
+                "mean": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+                **{f"p{p}": round(percentile(latencies, p), 3) for p in PERCENTILES},
+                "max": round(latencies[-1], 3) if latencies else 0.0,
+            },
+        }
+    return summary
+
+
+def print_summary(summary: dict[str, dict]) -> None:
+    header = f"{'endpoint':<36} {'req':>7} {'err':>5} {'rps':>8} " + " ".join(
+        f"{f'p{p}':>8}" for p in PERCENTILES
+    )
+    print(header)
+    for endpoint, stats in summary.items():
+        latency = stats["latency_ms"]
+        print(
+            f"{endpoint:<36} {stats['requests']:>7} {stats['errors']:>5} "
+            f"{stats['throughput_rps']:>8.1f} "
+            + " ".join(f"{latency[f'p{p}']:>8.1f}" for p in PERCENTILES)
+        )
+
+
+def print_comparison(summary: dict[str, dict], baseline_path: Path) -> None:
+    """Prints throughput and p95 changes against an earlier result file."""
+    baseline = json.loads(baseline_path.read_text())["endpoints"]
+    print(f"\nvs {baseline_path}:")
+    for endpoint, stats in summary.items():
+        previous = baseline.get(endpoint)
+        if previous is None:
+            continue
+        rps_change = _relative_change(previous["throughput_rps"], stats["throughput_rps"])
+        p95_change = _relative_change(previous["latency_ms"]["p95"], stats["latency_ms"]["p95"])
+        print(f"{endpoint:<36} rps {rps_change:>+7.1%}  p95 {p95_change:>+7.1%}")
+
+
+def _relative_change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def write_result(path: Path, metadata: dict, summary: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"metadata": metadata, "endpoints": summary}, indent=2))
@@ -0,0 +1,137 @@
+import random
+from collections import deque
+from typing import Awaitable, Callable
+from uuid import UUID, uuid4
+
+import httpx
+
+from benchmarks.stubs import stub_seller_ids
+
+Operation = Callable[[], Awaitable[tuple[str, httpx.Response]]]
+
+# operation name -> weight
+MIXES: dict[str, dict[str, int]] = {
+    "default": {
+        "checkout": 15,
+        "list_orders": 20,
+        "get_order": 15,
+        "confirm": 5,
+        "list_seller_orders": 5,
+        "cart_add": 15,
+        "cart_get": 10,
+        "favorites_set": 5,
+        "favorites_get": 10,
+    },
+    "checkout": {
+        "checkout": 60,
+        "get_order": 25,
+        "confirm": 15,
+    },
+    "browse": {
+        "list_orders": 25,
+        "get_order": 20,
+        "list_seller_orders": 10,
+        "seller_stats": 5,
+        "cart_get": 20,
+        "favorites_get": 20,
+    },
+}
+
+
+class TrafficMix:
+    """Weighted random choice of API calls made on behalf of a fixed pool of users.
+
+    Created orders are remembered, so order reads and confirms hit real rows.
+    The endpoint label of each call is the route template, not the URL.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        weights: dict[str, int],
+        users: int,
+        products: int,
+        seed: int | None = None,
+    ):
+        self._client = client
+        self._random = random.Random(seed)
+        self.user_ids: list[UUID] = [uuid4() for _ in range(users)]
+        self._products = products
+        self._orders: deque[UUID] = deque(maxlen=10_000)
+        self._unconfirmed: deque[UUID] = deque(maxlen=10_000)
+        self._operations: list[Operation] = [getattr(self, name) for name in weights]
+        self._weights = list(weights.values())
+
+    def pick(self) -> Operation:
+        return self._random.choices(self._operations, self._weights)[0]
+
+    def _user(self) -> UUID:
+        return self._random.choice(self.user_ids)
+
+    def _items(self, max_items: int = 5) -> list[dict]:
+        product_ids = self._random.sample(
+            range(1, self._products + 1), self._random.randint(1, max_items)
+        )
+        return [
+            {"product_id": product_id, "quantity": self._random.randint(1, 3)}
+            for product_id in product_ids
+        ]
+
+    async def checkout(self) -> tuple[str, httpx.Response]:
+        response = await self._client.post(
+            "/orders", json={"user_id": str(self._user()), "order_items": self._items()}
+        )
+        if response.status_code == 200:
+            order_id = UUID(response.json()["order_id"])
+            self._orders.append(order_id)
+            self._unconfirmed.append(order_id)
+        return "POST /orders", response
+
+    async def list_orders(self) -> tuple[str, httpx.Response]:
+        response = await self._client.get(
+            f"/orders/users/{self._user()}", params={"limit": 20}
+        )
+        return "GET /orders/users/{user_id}", response
+
+    async def list_seller_orders(self) -> tuple[str, httpx.Response]:
+        response = await self._client.get(
+            f"/orders/sellers/{self._random.choice(stub_seller_ids())}", params={"limit": 20}
+        )
+        return "GET /orders/sellers/{seller_id}", response
+
+    async def seller_stats(self) -> tuple[str, httpx.Response]:
+        response = await self._client.get(
+            f"/orders/sellers/{self._random.choice(stub_seller_ids())}/stats"
+        )
+        return "GET /orders/sellers/{seller_id}/stats", response
+
+    async def get_order(self) -> tuple[str, httpx.Response]:
+        if not self._orders:
+            return await self.checkout()
+        response = await self._client.get(f"/orders/{self._random.choice(self._orders)}")
+        return "GET /orders/{order_id}", response
+
+    async def confirm(self) -> tuple[str, httpx.Response]:
+        if not self._unconfirmed:
+            return await self.checkout()
+        # oldest first, so the reservation round trip has most likely finished
+        response = await self._client.post(f"/orders/{self._unconfirmed.popleft()}/confirm")
+        return "POST /orders/{order_id}/confirm", response
+
+    async def cart_add(self) -> tuple[str, httpx.Response]:
+        response = await self._client.post(
+            f"/cart/{self._user()}/items", json=self._items(max_items=1)[0]
+        )
+        return "POST /cart/{user_id}/items", response
+
+    async def cart_get(self) -> tuple[str, httpx.Response]:
+        response = await self._client.get(f"/cart/{self._user()}")
+        return "GET /cart/{user_id}", response
+
+    async def favorites_set(self) -> tuple[str, httpx.Response]:
+        response = await self._client.post(f"/favorites/{self._user()}", json=self._items())
+        return "POST /favorites/{user_id}", response
+
+    async def favorites_get(self) -> tuple[str, httpx.Response]:
+        response = await self._client.get(f"/favorites/{self._user()}")
+        return "GET /favorites/{user_id}", response
@@ -0,0 +1,63 @@
+import asyncio
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+import uvicorn
+from fastapi import FastAPI
+
+STUB_SELLERS = 20
+
+
+def stub_seller_ids() -> list[UUID]:
+    return [uuid5(NAMESPACE_URL, f"stub-seller-{number}") for number in range(STUB_SELLERS)]
+
+
+def stub_seller_id(product_id: int) -> UUID:
+    """Seller of a stub product; every product keeps the same seller."""
+    return stub_seller_ids()[product_id % STUB_SELLERS]
+
+
+def build_product_service_stub(latency: float = 0.0, price: float = 10.0) -> FastAPI:
+    """Minimal stand-in for the product service `/products/stock` endpoint."""
+    stub = FastAPI()
+
+    @stub.post("/products/stock")
+    async def stock(payload: dict):
+        if latency:
+            await asyncio.sleep(latency)
+        products = [
+            {
+                "product_id": item["product_id"],
+                "quantity": item["quantity"],
+                "price": price,
+                "seller_id": str(stub_seller_id(item["product_id"])),
+            }
+            for item in payload.get("items", [])
+        ]
+        return {
+            "ok": True,
+            "products": products,
+            "total_amount": sum(p["price"] * p["quantity"] for p in products),
+        }
+
+    return stub
+
+
+class StubServer:
+    """Runs an ASGI app with uvicorn inside the current event loop."""
+
+    def __init__(self, asgi_app, host: str = "127.0.0.1", port: int = 18080):
+        self.url = f"http://{host}:{port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(asgi_app, host=host, port=port, log_level="warning")
+        )
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "StubServer":
+        self._task = asyncio.create_task(self._server.serve())
+        while not self._server.started:
+            await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.should_exit = True
+        await self._task
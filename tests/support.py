@@ -0,0 +1,34 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+    """Collects the (statement, parameters) pairs the block sends through `engine`."""
+    statements: list[tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def assert_max_queries(engine: AsyncEngine, limit: int) -> Iterator[list[tuple[str, Any]]]:
+    """Fails when the block sends more than `limit` SQL statements through
+    `engine`; yields the list the statements are collected in."""
+    with capture_statements(engine) as statements:
+        yield statements
+
+    if len(statements) > limit:
+        listed = "\n".join(f"  {statement}" for statement, _ in statements)
+        raise AssertionError(
+            f"Expected at most {limit} SQL statements, got {len(statements)}:\n{listed}"
+        )
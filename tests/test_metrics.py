@@ -0,0 +1,97 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+
+from app.core.metrics import (
+    NAMESPACE,
+    CallbackGauge,
+    Histogram,
+    MetricsMiddleware,
+    metrics_registry,
+    render_metrics,
+)
+from app.core.profiling import RequestTimings, _request_timings
+
+
+def scrape() -> dict:
+    families = text_string_to_metric_families(render_metrics().decode())
+    return {family.name: family for family in families}
+
+
+def samples(family, name: str) -> dict:
+    return {
+        tuple(sorted(sample.labels.items())): sample.value
+        for sample in family.samples
+        if sample.name == name
+    }
+
+
+def request_count(**labels: str) -> float:
+    value = metrics_registry.get_sample_value(
+        f"{NAMESPACE}_http_request_duration_seconds_count", labels
+    )
+    return value or 0
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/test-metrics/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"item_id": item_id}
+
+    @app.get("/test-metrics/broken")
+    async def broken():
+        raise RuntimeError("broken")
+
+    @app.get("/metrics")
+    async def metrics():
+        return {}
+
+    return app
+
+
+def test_middleware_labels_requests_by_route_template_and_status():
+    client = TestClient(build_app(), raise_server_exceptions=False)
+    route = "/test-metrics/items/{item_id}"
+    unmatched = request_count(method="GET", route="unmatched", status="404")
+
+    client.get("/test-metrics/items/1")
+    client.get("/test-metrics/items/2")
+    client.get("/test-metrics/items/0")
+    client.get("/test-metrics/broken")
+    client.get("/test-metrics/missing")
+    client.get("/metrics")
+
+    assert request_count(method="GET", route=route, status="200") == 2
+    assert request_count(method="GET", route=route, status="404") == 1
+    # the exception escapes the middleware before a response is sent
+    assert request_count(method="GET", route="/test-metrics/broken", status="500") == 1
+    assert request_count(method="GET", route="unmatched", status="404") == unmatched + 1
+    assert request_count(method="GET", route="/metrics", status="200") == 0
+
+
+def test_histogram_adds_request_timings_of_its_component():
+    histogram = Histogram("test_component_seconds", "Test histogram.", component="sql")
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        histogram.observe(0.25)
+    finally:
+        _request_timings.reset(token)
+
+    assert timings.counts["sql"] == 1
+    assert timings.seconds["sql"] == 0.25
+
+
+def test_callback_gauge_skips_failing_collectors():
+    gauge = CallbackGauge("test_callback", "Test gauge.", ("cache", "stat"))
+    gauge.add_collector(lambda: {("stock", "hits"): 3})
+    gauge.add_collector(lambda: 1 / 0)
+
+    family = scrape()[f"{NAMESPACE}_test_callback"]
+    assert family.type == "gauge"
+    assert samples(family, family.name) == {(("cache", "stock"), ("stat", "hits")): 3}
@@ -0,0 +1,103 @@
+"""Statement budgets of the order listings.
+
+Every listing has to cost a fixed number of statements however many orders
+and items the page holds, so an N+1 regression fails here. The tests use
+the `session` fixture, so they need Postgres.
+"""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.database import engine
+from app.models.orders import OrderItemModel, OrderModel, OrderStatus
+from app.schemas import OrdersPageSchema
+from app.services.order_service import OrderService
+from tests.support import assert_max_queries
+
+ORDERS = 6
+ITEMS_PER_ORDER = 3
+PAGE_SIZE = 4
+
+
+@pytest.fixture
+async def seeded(session):
+    """One user's orders, each with one item of `seller_id` and the rest
+    of other sellers."""
+    user_id, seller_id = uuid4(), uuid4()
+    now = datetime.now(timezone.utc)
+    orders, items = [], []
+    for number in range(ORDERS):
+        order_id, created_at = uuid4(), now - timedelta(days=number)
+        orders.append(
+            {
+                "id": order_id,
+                "created_at": created_at,
+                "user_id": user_id,
+                "status": OrderStatus.PENDING,
+                "total_amount": 10.0 * ITEMS_PER_ORDER,
+            }
+        )
+        items.extend(
+            {
+                "id": uuid4(),
+                "created_at": created_at,
+                "order_id": order_id,
+                "product_id": product_id,
+                "quantity": 1,
+                "price": 10.0,
+                "seller_id": seller_id if product_id == 0 else uuid4(),
+            }
+            for product_id in range(ITEMS_PER_ORDER)
+        )
+    await session.execute(insert(OrderModel), orders)
+    await session.execute(insert(OrderItemModel), items)
+    return user_id, seller_id, orders
+
+
+async def test_orders_by_user_id(session, seeded):
+    user_id, _, orders = seeded
+
+    with assert_max_queries(engine, 2):
+        result = await OrderService.get_orders_by_user_id(session, user_id)
+
+    assert len(result["orders"]) == ORDERS
+    assert all(len(order["order_items"]) == ITEMS_PER_ORDER for order in result["orders"])
+
+
+async def test_orders_by_user_id_page(session, seeded):
+    user_id, _, _ = seeded
+    page = OrdersPageSchema(limit=PAGE_SIZE)
+
+    with assert_max_queries(engine, 2):
+        first = await OrderService.get_orders_by_user_id(session, user_id, page)
+    with assert_max_queries(engine, 2):
+        second = await OrderService.get_orders_by_user_id(
+            session, user_id, OrdersPageSchema(limit=PAGE_SIZE, cursor=first["next_cursor"])
+        )
+
+    assert len(first["orders"]) + len(second["orders"]) == ORDERS
+    assert second["next_cursor"] is None
+
+
+async def test_orders_by_seller_id(session, seeded):
+    _, seller_id, _ = seeded
+
+    with assert_max_queries(engine, 3):
+        result = await OrderService.get_orders_by_seller_id(session, seller_id)
+
+    assert len(result["orders"]) == ORDERS
+    assert all(len(order["order_items"]) == 1 for order in result["orders"])
+
+
+async def test_get_order_items(session, seeded):
+    _, _, orders = seeded
+    created_at = [order["created_at"] for order in orders]
+
+    with assert_max_queries(engine, 1):
+        rows = await OrderService._get_order_items(
+            session, [order["id"] for order in orders], (min(created_at), max(created_at))
+        )
+
+    assert len(rows) == ORDERS * ITEMS_PER_ORDER
@@ -0,0 +1,113 @@
+"""EXPLAIN regression check for the read queries of the order routes.
+
+Each route's queries are captured on a small seeded data set and EXPLAINed
+with sequential scans disabled, so a plan still scanning one of the large
+tables (or any of their partitions) means no index serves that query. The
+tests use the `session` fixture, so they need Postgres.
+"""
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.services.order_service import OrderService
+from app.services.purchases_service import PurchasesService
+from app.services.seller_stats_service import SellerStatsService
+from tests.support import capture_statements
+
+LARGE_TABLES = ("orders", "order_items", "orders_archive", "seller_daily_stats")
+
+SEED_ORDERS_SQL = text(
+    """
+    INSERT INTO orders (id, user_id, status, total_amount, created_at)
+    SELECT gen_random_uuid(),
+           md5('user' || (i % 50))::uuid,
+           'COMPLETED',
+           100,
+           now() - make_interval(mins => i)
+    FROM generate_series(1, 1000) AS i
+    """
+)
+
+SEED_ITEMS_SQL = text(
+    """
+    INSERT INTO order_items (id, order_id, product_id, quantity, price, seller_id, created_at)
+    SELECT gen_random_uuid(),
+           o.id,
+           (abs(hashtext(o.id::text || n)) % 100000),
+           1,
+           10,
+           md5('seller' || (abs(hashtext(o.id::text || n)) % 5))::uuid,
+           o.created_at
+    FROM orders AS o, generate_series(1, 3) AS n
+    """
+)
+
+QUERIES = {
+    "get_order_by_id": lambda s, sample: OrderService.load_order(s, sample.id),
+    "get_orders_by_user_id": lambda s, sample: OrderService.get_orders_by_user_id(
+        s, sample.user_id
+    ),
+    "get_orders_by_seller_id": lambda s, sample: OrderService.get_orders_by_seller_id(
+        s, sample.seller_id
+    ),
+    "get_orders_by_seller_id_json": lambda s, sample: OrderService.get_orders_by_seller_id_json(
+        s, sample.seller_id
+    ),
+    "get_orders_count_by_seller_id": lambda s, sample: OrderService.get_orders_count_by_seller_id(
+        s, sample.seller_id
+    ),
+    "get_seller_stats": lambda s, sample: SellerStatsService.get_stats(s, sample.seller_id),
+    "get_purchased_product_ids": lambda s, sample: PurchasesService.get_purchased_product_ids(
+        s, sample.user_id
+    ),
+}
+
+
+def is_large_table(relation: str | None) -> bool:
+    return relation is not None and any(
+        relation == table or relation.startswith(f"{table}_p") or relation == f"{table}_default"
+        for table in LARGE_TABLES
+    )
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and is_large_table(plan.get("Relation Name")):
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+@pytest.fixture
+async def sample(session):
+    await session.execute(SEED_ORDERS_SQL)
+    await session.execute(SEED_ITEMS_SQL)
+    for table in LARGE_TABLES:
+        await session.execute(text(f"ANALYZE {table}"))
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    return (
+        await session.execute(
+            text(
+                "SELECT o.id, o.user_id, i.seller_id "
+                "FROM orders o JOIN order_items i ON i.order_id = o.id LIMIT 1"
+            )
+        )
+    ).one()
+
+
+@pytest.mark.parametrize("name", QUERIES)
+async def test_query_uses_indexes(session, sample, name):
+    with capture_statements(engine) as statements:
+        await QUERIES[name](session, sample)
+    assert statements
+
+    conn = await session.connection()
+    for statement, parameters in statements:
+        plan = (await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        seq_scans = find_seq_scans(plan[0]["Plan"])
+        assert not seq_scans, f"seq scan on {', '.join(seq_scans)}:\n{' '.join(statement.split())}"